@@ -2,14 +2,12 @@
 AiCupid 퀴즈 에이전트 실행 로직.
 - run_quiz_agent: 단일 메시지 → 퀴즈/채팅 응답 (기존 /invoke 호환)
 - run_chat_agent: 채팅 히스토리 → 응답 + 상태
+- stream_chat_agent: run_chat_agent의 스트리밍 버전 (chat 노드 토큰 → delta 이벤트)
 """
 
 from __future__ import annotations
 
-import uuid
-from typing import Any
-
-from langgraph.checkpoint.memory import MemorySaver
+from collections.abc import AsyncIterator
 
 from ai_agent.schemas import (
     ChatMessage,
@@ -19,17 +17,19 @@ from ai_agent.schemas import (
     QuizAgentResponse,
 )
 
-_memory = MemorySaver()
-_api_graph = None
 
+def _session_config(session_id: str) -> dict:
+    return {"configurable": {"thread_id": session_id}}
 
-def _get_graph():
-    """Lazy import: 퀴즈 LangGraph (checkpointer 포함)."""
-    global _api_graph
-    if _api_graph is None:
-        from ai_agent.graph import build_quiz_graph
-        _api_graph = build_quiz_graph().compile(checkpointer=_memory)
-    return _api_graph
+
+async def _invoke_with_session(session_id: str, user_message: str) -> dict:
+    """session_id가 있으면 공유 SQLite 체크포인터 그래프로 실행 (상태는 서버에 저장된 것 사용)."""
+    from ai_agent.graph import get_compiled_graph
+
+    return await get_compiled_graph().ainvoke(
+        {"messages": [("user", user_message)]},
+        _session_config(session_id),
+    )
 
 
 _plain_runnable = None
@@ -51,19 +51,15 @@ async def run_quiz_agent(request: QuizAgentRequest) -> QuizAgentResponse:
     """
     사용자 메시지를 받아 퀴즈/채팅 그래프를 한 번 실행하고 응답을 반환합니다.
     """
-    graph = _get_graph()
-    config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+    if request.session_id:
+        result = await _invoke_with_session(request.session_id, request.input)
+    else:
+        # 세션 없이 호출: 클라이언트가 넘긴 state로 한 번 실행 (체크포인트 저장 없음)
+        current_state = request.state or {"messages": [], "question_id": 0, "score": 0}
+        current_state["messages"] = current_state.get("messages", []) + [("user", request.input)]
+        result = await get_app_runnable().ainvoke(current_state)
 
-    current_state = request.state or {"messages": [], "question_id": 0, "score": 0}
-    current_state["messages"] = current_state.get("messages", []) + [("user", request.input)]
-
-    result = await graph.ainvoke(current_state, config)
-
-    last_ai_message = ""
-    for role, msg in reversed(result.get("messages", [])):
-        if role == "ai":
-            last_ai_message = msg if isinstance(msg, str) else getattr(msg, "content", str(msg))
-            break
+    last_ai_message = result.get("last_ai") or ""
 
     return QuizAgentResponse(response=last_ai_message, state=result)
 
@@ -74,34 +70,74 @@ async def run_quiz_agent(request: QuizAgentRequest) -> QuizAgentResponse:
 async def run_chat_agent(
     messages: list[ChatMessage],
     state: dict | None = None,
+    session_id: str | None = None,
 ) -> ChatResponse:
     """
     채팅 메시지 목록을 받아 마지막 사용자 메시지로 그래프를 실행하고 응답을 반환합니다.
     """
-    user_message = ""
-    for msg in reversed(messages):
-        if msg.role == "user":
-            user_message = msg.content
-            break
+    user_message = _last_user_message(messages)
+    if not user_message:
+        return ChatResponse(reply=_EMPTY_MESSAGE_REPLY, state=state or _new_state())
+
+    if session_id:
+        result = await _invoke_with_session(session_id, user_message)
+    else:
+        runnable, graph_input, config = _chat_run_args(user_message, state, None)
+        result = await runnable.ainvoke(graph_input, config)
+
+    last_ai_message = result.get("last_ai") or ""
+
+    return ChatResponse(reply=last_ai_message, state=result)
+
 
+async def stream_chat_agent(
+    messages: list[ChatMessage],
+    state: dict | None = None,
+    session_id: str | None = None,
+) -> AsyncIterator[dict]:
+    """
+    run_chat_agent와 같은 실행을 astream_events(v2)로 돌려,
+    chat 노드 LLM 토큰은 {"type":"delta","text"}로 즉시, 끝나면 {"type":"done","reply","state"}를 yield.
+    """
+    user_message = _last_user_message(messages)
     if not user_message:
-        return ChatResponse(
-            reply="메시지를 입력해 주세요.",
-            state=state or {"messages": [], "question_id": 0, "score": 0},
-        )
+        yield {"type": "done", "reply": _EMPTY_MESSAGE_REPLY, "state": state or _new_state()}
+        return
 
-    graph = _get_graph()
-    config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+    runnable, graph_input, config = _chat_run_args(user_message, state, session_id)
+    result = {}
+    async for ev in runnable.astream_events(graph_input, config=config, version="v2"):
+        kind = ev["event"]
+        if kind == "on_chat_model_stream" and ev["metadata"].get("langgraph_node") == "chat":
+            text = ev["data"]["chunk"].content
+            if isinstance(text, str) and text:
+                yield {"type": "delta", "text": text}
+        elif kind == "on_chain_end" and not ev.get("parent_ids"):
+            # 루트 그래프 종료 이벤트의 output = 최종 상태
+            result = ev["data"].get("output") or {}
+    yield {"type": "done", "reply": result.get("last_ai") or "", "state": result}
 
-    base = state or {"messages": [], "question_id": 0, "score": 0}
-    base["messages"] = base.get("messages", []) + [("user", user_message)]
 
-    result = await graph.ainvoke(base, config)
+_EMPTY_MESSAGE_REPLY = "메시지를 입력해 주세요."
 
-    last_ai_message = ""
-    for role, msg in reversed(result.get("messages", [])):
-        if role == "ai":
-            last_ai_message = msg if isinstance(msg, str) else getattr(msg, "content", str(msg))
-            break
 
-    return ChatResponse(reply=last_ai_message, state=result)
+def _new_state() -> dict:
+    return {"messages": [], "question_id": 0, "score": 0}
+
+
+def _last_user_message(messages: list[ChatMessage]) -> str:
+    for msg in reversed(messages):
+        if msg.role == "user":
+            return msg.content
+    return ""
+
+
+def _chat_run_args(user_message: str, state: dict | None, session_id: str | None):
+    """(runnable, 그래프 입력, config). session_id가 있으면 체크포인터 그래프 + 새 메시지만, 없으면 state에 이어 붙임."""
+    if session_id:
+        from ai_agent.graph import get_compiled_graph
+
+        return get_compiled_graph(), {"messages": [("user", user_message)]}, _session_config(session_id)
+    base = state or _new_state()
+    base["messages"] = base.get("messages", []) + [("user", user_message)]
+    return get_app_runnable(), base, None
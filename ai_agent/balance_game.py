@@ -9,6 +9,7 @@ import re
 from typing import TYPE_CHECKING
 
 from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.tools import tool
 
 if TYPE_CHECKING:
     pass
@@ -37,6 +38,12 @@ def parse_balance_game_three(llm_output: str) -> list[tuple[str, str, str]] | No
     return result if len(result) == 3 else None
 
 
+@tool
+def start_balance_game() -> str:
+    """참가자가 밸런스 게임을 하자고 하거나, MC가 밸런스 게임을 제안·시작할 때 호출하세요. 대화 맥락에 맞는 밸런스 게임 질문 3개가 생성됩니다."""
+    return ""
+
+
 def generate_balance_game_questions(conversation_context: str) -> list[tuple[str, str, str]] | None:
     """
     대화 맥락 문자열을 받아 밸런스 게임 질문 3개를 생성합니다.
@@ -1,59 +1,69 @@
 """
 AiCupid 퀴즈 LangGraph 정의.
-router → grade / ask_question / chat / finish
+router → grade / ask_question / chat / finish (라우터가 Command(goto=...)로 직접 분기)
+grade 뒤에는 남은 문항이 있으면 ask_question, 없으면 finish로 이어지고, 나머지 노드는 실행 후 종료
 """
 
 from __future__ import annotations
 
-import operator
-from typing import Annotated, TypedDict
+import asyncio
+from typing import Annotated, Literal, TypedDict
 
 from langgraph.graph import END, StateGraph
-from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
-from langchain_core.tools import tool
+from langgraph.graph.message import add_messages
+from langgraph.types import Command
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage
 
 from ai_agent.prompts import AI_MC_SYSTEM_PROMPT
-from ai_agent.balance_game import generate_balance_game_questions
-from quiz_chain import QuizGrader, QuestionProvider, quiz_data, get_llm, get_react_chain
-
-
-@tool
-def start_balance_game() -> str:
-    """참가자가 밸런스 게임을 하자고 하거나, MC가 밸런스 게임을 제안·시작할 때 호출하세요. 대화 맥락에 맞는 밸런스 게임 질문 3개가 생성됩니다."""
-    return ""
+from ai_agent.balance_game import generate_balance_game_questions, start_balance_game
+from quiz_chain import QuizGrader, QuestionProvider, quiz_data, get_llm
+# 라우터 키워드·고정 문구·라우트 테이블은 services.agent 한 곳에서 정의 (두 그래프가 어긋나지 않게)
+from services.agent import (
+    ASK_QUESTION_TEMPLATE,
+    CORRECT_TEMPLATE,
+    FINISH_REPLY,
+    WRONG_TEMPLATE,
+    _QUESTION_MARK,
+    _ROUTER_RE,
+    _ROUTES,
+    _after_grade_reply,
+)
+
+_QUIZ_LEN = len(quiz_data)
+
+# 이 그래프에는 canned 노드가 없음
+_RouterGoto = Literal["grade_answer", "ask_question", "chat", "finish"]
 
 
 class AgentState(TypedDict):
     """퀴즈 그래프 상태."""
 
-    messages: Annotated[list, operator.add]
+    messages: Annotated[list[BaseMessage], add_messages]  # ("user", text) 입력도 HumanMessage로 변환됨
     question_id: int
     score: int
-    next_action: str
+    last_ai: str  # 마지막 AI 응답 텍스트 (run_*_agent에서 messages 역순 탐색 없이 바로 사용)
 
 
 def build_quiz_graph() -> StateGraph:
     """퀴즈/채팅 LangGraph를 빌드하여 반환 (compile은 호출 측에서). LLM은 첫 실행 시 로드."""
 
-    def router_node(state: AgentState):
+    def router_node(state: AgentState) -> Command[_RouterGoto]:
         messages = state.get("messages") or []
         
         if not messages:
-            return {"next_action": "chat", "question_id": 0, "score": 0}
+            return Command(update={"question_id": 0, "score": 0}, goto="chat")
             
-        last_message = messages[-1]
-        
-        last_content = last_message[1] if isinstance(last_message, (list, tuple)) and len(last_message) > 1 else str(last_message)
+        last_content = messages[-1].content
         
         question_id = state.get("question_id", 0)
         score = state.get("score", 0)
         action = "chat"
         
-        if question_id < len(quiz_data):
+        if question_id < _QUIZ_LEN:
             if (
                 len(messages) > 1
-                and messages[-2][0] == "ai"
-                and "질문" in (messages[-2][1] if isinstance(messages[-2], (list, tuple)) and len(messages[-2]) > 1 else str(messages[-2]))
+                and isinstance(messages[-2], AIMessage)
+                and _QUESTION_MARK in messages[-2].content
             ):
                 action = "grade"
             else:
@@ -61,61 +71,59 @@ def build_quiz_graph() -> StateGraph:
         else:
             action = "finish"
             
-        if "퀴즈" in last_content and "시작" in last_content:
+        if _ROUTER_RE.search(last_content) is not None:
             action = "ask"
             
-        return {"next_action": action, "question_id": question_id, "score": score}
+        # 상태 갱신과 분기를 한 번에 (조건부 엣지용 next_action 쓰기/읽기 없음)
+        return Command(update={"question_id": question_id, "score": score}, goto=_ROUTES[action])
 
-    def grade_answer_node(state: AgentState):
+    async def grade_answer_node(state: AgentState):
         messages = state.get("messages") or []
-        user_message = messages[-1] if messages else ("user", "")
-        user_answer = user_message[1] if isinstance(user_message, (list, tuple)) and len(user_message) > 1 else str(user_message)
+        user_answer = messages[-1].content if messages else ""
         q_id = state.get("question_id", 0)
         grader = QuizGrader(user_answer=user_answer, question_id=q_id)
-        is_correct = grader.grade()
+        is_correct = await grader.grade()
         new_score = state.get("score", 0)
         if is_correct:
             new_score += 1
-            response_message = f"정답입니다! 현재 점수: {new_score}"
+            response_message = CORRECT_TEMPLATE.format(score=new_score)
         else:
             # [변경] 정답 데이터를 quiz_data에서 안전하게 참조하여 피드백 메시지 생성
             correct_answer = quiz_data[q_id]["answer"]
-            response_message = f"아쉽네요. 정답은 '{correct_answer}'입니다. 현재 점수: {new_score}"
+            response_message = f"{WRONG_TEMPLATE.format(answer=correct_answer)} 현재 점수: {new_score}"
             
         next_q_id = q_id + 1
         return {
-            "messages": [("ai", response_message)],
+            "messages": [AIMessage(content=response_message)],
+            "last_ai": response_message,
             "score": new_score,
             "question_id": next_q_id,
         }
 
-    def ask_question_node(state: AgentState):
+    async def ask_question_node(state: AgentState):
         q_id = state.get("question_id", 0)
         provider = QuestionProvider(question_id=q_id)
-        question = provider.get_question()
+        question = await provider.get_question()
         
         # [변경] 문제 번호에 따라 질문 접두사를 동적으로 생성하도록 개선
-        message = f"퀴즈 질문입니다: {question}" if q_id < len(quiz_data) else question
-        return {"messages": [("ai", message)]}
+        message = ASK_QUESTION_TEMPLATE.format(question=question) if q_id < _QUIZ_LEN else question
+        return {"messages": [AIMessage(content=message)], "last_ai": _after_grade_reply(state, message)}
 
-    def chat_node(state: AgentState):
+    def finish_node(state: AgentState):
+        # 퀴즈 종료 후 발화: 고정 문구로 응답 (last_ai를 갱신하지 않으면 이전 응답이 다시 재생됨)
+        return {"messages": [AIMessage(content=FINISH_REPLY)], "last_ai": _after_grade_reply(state, FINISH_REPLY)}
+
+    async def chat_node(state: AgentState):
         messages = state.get("messages") or []
         # AI MC 역할 + 밸런스 게임 도구 사용 안내
         system_content = (
             AI_MC_SYSTEM_PROMPT
             + "\n\n참가자가 밸런스 게임을 하자고 하거나 게임을 제안하면 start_balance_game 도구를 호출하세요."
         )
-        lc_messages = [SystemMessage(content=system_content)]
-        for m in messages:
-            if isinstance(m, (list, tuple)) and len(m) >= 2:
-                role, content = m[0], m[1]
-            else:
-                role, content = "user", str(m)
-            text = content if isinstance(content, str) else getattr(content, "content", str(content))
-            lc_messages.append(HumanMessage(content=text) if role == "user" else AIMessage(content=text))
+        lc_messages = [SystemMessage(content=system_content), *messages]
 
         llm_with_tools = get_llm().bind_tools([start_balance_game])
-        response = llm_with_tools.invoke(lc_messages)
+        response = await llm_with_tools.ainvoke(lc_messages)
 
         # 도구 호출이 있으면 실행 후 재호출
         if getattr(response, "tool_calls", None):
@@ -123,17 +131,11 @@ def build_quiz_graph() -> StateGraph:
             for tc in response.tool_calls:
                 if tc.get("name") == "start_balance_game":
                     # 대화 맥락 문자열 구성
-                    context_parts = []
-                    for m in messages:
-                        if isinstance(m, (list, tuple)) and len(m) >= 2:
-                            role, content = m[0], m[1]
-                        else:
-                            role, content = "user", str(m)
-                        text = content if isinstance(content, str) else getattr(content, "content", str(content))
-                        prefix = "user" if role == "user" else "ai"
-                        context_parts.append(f"- {prefix}: {text}")
+                    context_parts = [
+                        f"- {'user' if isinstance(m, HumanMessage) else 'ai'}: {m.content}" for m in messages
+                    ]
                     context = "\n".join(context_parts) if context_parts else "(아직 대화 없음)"
-                    questions = generate_balance_game_questions(context)
+                    questions = await asyncio.to_thread(generate_balance_game_questions, context)
                     if questions:
                         lines = []
                         for i, (q, a, b) in enumerate(questions, 1):
@@ -146,33 +148,29 @@ def build_quiz_graph() -> StateGraph:
                     )
             lc_messages.append(response)
             lc_messages.extend(tool_messages)
-            response = llm_with_tools.invoke(lc_messages)
+            response = await llm_with_tools.ainvoke(lc_messages)
 
         ai_content = response.content if hasattr(response, "content") else str(response)
-        return {"messages": [("ai", ai_content)]}
-
-    # [추가] 조건부 엣지(conditional_edges)에서 사용할 상태 판단 전용 헬퍼 함수 분리
-    def decide_next_step(state: AgentState):
-        return state.get("next_action", "chat")
+        return {"messages": [AIMessage(content=ai_content)], "last_ai": ai_content}
 
     workflow = StateGraph(AgentState)
     workflow.add_node("router", router_node)
     workflow.add_node("grade_answer", grade_answer_node)
     workflow.add_node("ask_question", ask_question_node)
     workflow.add_node("chat", chat_node)
+    workflow.add_node("finish", finish_node)
     
     workflow.set_entry_point("router")
-    
-    # [변경] 람다 함수 대신 명시적인 decide_next_step 함수를 사용하여 가독성 향상
-    workflow.add_conditional_edges(
-        "router",
-        decide_next_step,
-        {"grade": "grade_answer", "ask": "ask_question", "chat": "chat", "finish": END},
-    )
-    
-    workflow.add_edge("grade_answer", "router")
-    workflow.add_edge("ask_question", "router")
-    workflow.add_edge("chat", "router")
+
+    def after_grade(state: AgentState) -> Literal["ask_question", "finish"]:
+        # 채점 후 같은 턴에 다음 질문(또는 종료 문구)까지 → 사용자의 다음 발화가 곧바로 채점됨
+        return "ask_question" if state.get("question_id", 0) < _QUIZ_LEN else "finish"
+
+    # router는 Command(goto=...)로 분기. 채점 뒤에는 다음 질문/종료로 이어지고, 나머지 응답 노드는 실행 후 종료
+    workflow.add_conditional_edges("grade_answer", after_grade, ["ask_question", "finish"])
+    workflow.add_edge("ask_question", END)
+    workflow.add_edge("chat", END)
+    workflow.add_edge("finish", END)
 
     return workflow
 
@@ -181,10 +179,12 @@ _compiled_graph = None
 
 def get_compiled_graph():
     """
-    퀴즈 그래프를 컴파일해 반환합니다.
-    (SqliteSaver 사용 시: pip install langgraph-checkpoint-sqlite 후 checkpointer 인자 추가 가능)
+    퀴즈 그래프를 공유 SQLite 체크포인터와 함께 컴파일해 반환합니다.
+    config의 thread_id(=session_id)로 세션 상태를 이어서 사용. 이벤트 루프 안에서 호출.
     """
     global _compiled_graph
     if _compiled_graph is None:
-        _compiled_graph = build_quiz_graph().compile()
+        from services.checkpointer import get_checkpointer
+
+        _compiled_graph = build_quiz_graph().compile(checkpointer=get_checkpointer())
     return _compiled_graph
@@ -15,16 +15,9 @@ logger = logging.getLogger(__name__)
 
 from langgraph.graph import END, StateGraph
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
-from langchain_core.tools import tool
 
 from ai_agent.prompts import AI_MC_SYSTEM_PROMPT
-from ai_agent.balance_game import generate_balance_game_questions
-
-
-@tool
-def start_balance_game() -> str:
-    """참가자가 밸런스 게임을 하자고 하거나, MC가 밸런스 게임을 제안·시작할 때 호출하세요. 대화 맥락에 맞는 밸런스 게임 질문 3개가 생성됩니다."""
-    return ""
+from ai_agent.balance_game import generate_balance_game_questions, start_balance_game
 
 
 class LiveContextState(TypedDict, total=False):
@@ -166,15 +159,9 @@ def build_live_context_graph() -> StateGraph:
     return workflow
 
 
-_compiled_live_context_graph = None
-
-
 def get_live_context_graph():
-    """컴파일된 Live 컨텍스트 그래프 반환."""
-    global _compiled_live_context_graph
-    if _compiled_live_context_graph is None:
-        _compiled_live_context_graph = build_live_context_graph().compile()
-    return _compiled_live_context_graph
+    """컴파일된 Live 컨텍스트 그래프 반환 (Studio용 모듈 레벨 agent와 같은 인스턴스 — 중복 컴파일 없음)."""
+    return agent
 
 
 def get_system_instruction_from_conversation_bytes(raw_bytes: bytes) -> str:
@@ -21,6 +21,10 @@ class QuizAgentRequest(BaseModel):
         None,
         description="이전 상태 (messages, question_id, score). 없으면 새 세션으로 시작",
     )
+    session_id: str | None = Field(
+        None,
+        description="세션 ID. 주면 서버 체크포인트에서 상태를 이어서 사용 (state 무시)",
+    )
 
 
 class QuizAgentResponse(BaseModel):
@@ -47,6 +51,10 @@ class ChatRequest(BaseModel):
         None,
         description="퀴즈 상태 (question_id, score 등). 없으면 새 세션",
     )
+    session_id: str | None = Field(
+        None,
+        description="세션 ID. 주면 서버 체크포인트에서 상태를 이어서 사용 (마지막 사용자 메시지만 전달)",
+    )
 
 
 class ChatResponse(BaseModel):
@@ -2,9 +2,14 @@
 AiCupid AI 에이전트 HTTP 라우트.
 """
 
+import logging
+
+import orjson
 from fastapi import APIRouter, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 
-from ai_agent.agent import run_chat_agent, run_quiz_agent
+from ai_agent.agent import run_chat_agent, run_quiz_agent, stream_chat_agent
 from ai_agent.schemas import (
     ChatRequest,
     ChatResponse,
@@ -12,6 +17,8 @@ from ai_agent.schemas import (
     QuizAgentResponse,
 )
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/agent", tags=["ai-agent"])
 
 
@@ -31,6 +38,29 @@ async def quiz_invoke(request: QuizAgentRequest) -> QuizAgentResponse:
 async def chat_with_agent(request: ChatRequest) -> ChatResponse:
     """채팅 메시지 목록을 받아 퀴즈/대화 응답을 반환합니다."""
     try:
-        return await run_chat_agent(request.messages, request.state)
+        return await run_chat_agent(request.messages, request.state, request.session_id)
     except Exception as e:
         raise HTTPException(status_code=503, detail=f"에이전트 오류: {e}")
+
+
+def _sse(event: dict) -> bytes:
+    """SSE data 한 줄 (state의 LangChain 메시지 객체도 JSON으로 변환)."""
+    return b"data: " + orjson.dumps(jsonable_encoder(event)) + b"\n\n"
+
+
+@router.post("/chat/stream")
+async def chat_with_agent_stream(request: ChatRequest) -> StreamingResponse:
+    """
+    /agent/chat의 스트리밍 버전 (text/event-stream).
+    data: {"type":"delta","text"} 를 토큰 도착 즉시, 마지막에 data: {"type":"done","reply","state"} 전송.
+    """
+
+    async def events():
+        try:
+            async for event in stream_chat_agent(request.messages, request.state, request.session_id):
+                yield _sse(event)
+        except Exception as e:  # 스트림 시작 후에는 상태 코드를 바꿀 수 없으므로 error 이벤트로 전달
+            logger.exception("에이전트 스트리밍 오류")
+            yield _sse({"type": "error", "text": f"에이전트 오류: {e}"})
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
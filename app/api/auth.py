@@ -1,3 +1,5 @@
+import asyncio
+import logging
 import os
 import base64
 from io import BytesIO
@@ -6,7 +8,8 @@ from passlib.context import CryptContext
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 from jose import jwt
 from passlib.context import CryptContext
@@ -22,12 +25,24 @@ PWD_CONTEXT = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "fallback-for-local-dev")
 ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(tags=["auth"])
 
+
+# PBKDF2 해시/검증은 CPU 바운드(수십 ms) → 이벤트 루프를 막지 않도록 스레드풀에서 실행
+async def _hash_password(password: str) -> str:
+    return await asyncio.to_thread(PWD_CONTEXT.hash, password)
+
+
+async def _verify_password(password: str, hashed_password: str) -> bool:
+    return await asyncio.to_thread(PWD_CONTEXT.verify, password, hashed_password)
+
+
 @router.post("/register")
-async def register(user_data: RegisterRequest, db: Session = Depends(get_db)):
+async def register(user_data: RegisterRequest, db: AsyncSession = Depends(get_db)):
     # 1. 중복 체크
-    if db.query(User).filter(User.userId == user_data.userId).first():
+    if (await db.execute(select(User).where(User.userId == user_data.userId))).scalars().first():
         raise HTTPException(status_code=400, detail="이미 존재하는 ID입니다.")
 
     # 2. Base64 이미지 처리 (있을 경우에만 업로드)
@@ -42,12 +57,12 @@ async def register(user_data: RegisterRequest, db: Session = Depends(get_db)):
             # 정의된 변수를 사용하여 업로드 호출
             image_url = upload_file_to_s3_raw(image_data, f"{user_data.userId}.{ext}", ext)
         except Exception as e:
-            print(f"이미지 업로드 실패: {e}")
+            logger.warning("이미지 업로드 실패: %s", e)
 
     # 3. 유저 저장
     new_user = User(
         userId=user_data.userId,
-        hashed_password=PWD_CONTEXT.hash(user_data.password),
+        hashed_password=await _hash_password(user_data.password),
         name=user_data.name,
         gender=user_data.gender,
         age=user_data.age,
@@ -57,14 +72,14 @@ async def register(user_data: RegisterRequest, db: Session = Depends(get_db)):
         profile_image_url=image_url
     )
     db.add(new_user)
-    db.commit()
+    await db.commit()
     return {"status": "ok"}
 
 @router.post("/login")
-async def login(request: LoginRequest, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.userId == request.userId).first()
+async def login(request: LoginRequest, db: AsyncSession = Depends(get_db)):
+    user = (await db.execute(select(User).where(User.userId == request.userId))).scalars().first()
     
-    if not user or not PWD_CONTEXT.verify(request.password, user.hashed_password):
+    if not user or not await _verify_password(request.password, user.hashed_password):
         raise HTTPException(status_code=401, detail="아이디 또는 비밀번호 오류")
 
     # 토큰 생성
@@ -88,12 +103,12 @@ async def login(request: LoginRequest, db: Session = Depends(get_db)):
 
 # Swagger Authorize용: OAuth2 형식(form)으로 받아 access_token 반환
 @router.post("/token")
-async def login_token(form: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login_token(form: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
     """
     Swagger/OpenAPI Authorize 버튼용. username에 userId, password에 비밀번호를 넣으세요.
     """
-    user = db.query(User).filter(User.userId == form.username).first()
-    if not user or not PWD_CONTEXT.verify(form.password, user.hashed_password):
+    user = (await db.execute(select(User).where(User.userId == form.username))).scalars().first()
+    if not user or not await _verify_password(form.password, user.hashed_password):
         raise HTTPException(status_code=401, detail="아이디 또는 비밀번호 오류")
     token = jwt.encode({"sub": user.userId}, SECRET_KEY, algorithm=ALGORITHM)
     return {"access_token": token, "token_type": "bearer"}
@@ -101,7 +116,7 @@ async def login_token(form: OAuth2PasswordRequestForm = Depends(), db: Session =
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/token")
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="인증 정보가 유효하지 않습니다.",
@@ -115,7 +130,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
     except JWTError:
         raise credentials_exception
         
-    user = db.query(User).filter(User.userId == user_id).first()
+    user = (await db.execute(select(User).where(User.userId == user_id))).scalars().first()
     if user is None:
         raise credentials_exception
     return user
\ No newline at end of file
@@ -1,14 +1,13 @@
 import base64
 import json
+import logging
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.models.user import User
-from app.schemas.user import UserProfile
-from app.schemas.user import ProfileUpdateRequest
 from app.api.auth import get_current_user
-from app.schemas.user import UserProfile, ProfileUpdateRequest, MatchableUserListResponse, MatchableUserResponse
 from services.s3_service import upload_file_to_s3_raw
 from fastapi import Query
 from sqlalchemy import func
@@ -20,16 +19,26 @@ from app.schemas.user import (
     ProfileUpdateRequest, 
     MatchableUserListResponse, 
     MatchableUserResponse, 
-    CompatibilityResponse
+    CompatibilityResponse,
+    MATCHABLE_USER_LIST_ADAPTER,
 )
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api/users", tags=["users"])
 
+
+def _matchable_user_list_response(users: list[MatchableUserResponse], total_count: int) -> Response:
+    """이미 검증된 MatchableUserResponse 목록을 미리 빌드한 어댑터로 바로 직렬화 (FastAPI 재검증 생략)."""
+    body = MatchableUserListResponse.model_construct(users=users, total_count=total_count)
+    return Response(content=MATCHABLE_USER_LIST_ADAPTER.dump_json(body), media_type="application/json")
+
+
 @router.put("/profile")
 async def update_profile(
     update_data: ProfileUpdateRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     # 1. 이미지 처리 (새 이미지가 Base64로 들어온 경우)
     if update_data.profileImage and "base64," in update_data.profileImage:
@@ -43,7 +52,7 @@ async def update_profile(
             if new_image_url:
                 current_user.profile_image_url = new_image_url
         except Exception as e:
-            print(f"프로필 이미지 수정 실패: {e}")
+            logger.warning("프로필 이미지 수정 실패: %s", e)
 
     # 2. 필드 업데이트
     update_fields = ["name", "gender", "age", "interests", "mbti", "bio"]
@@ -52,8 +61,8 @@ async def update_profile(
         if value is not None: # 값이 제공된 것만 수정
             setattr(current_user, field, value)
 
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    await db.refresh(current_user)
 
     return {
         "status": "ok",
@@ -91,28 +100,30 @@ async def search_users_by_id(
     skip: int = 0,
     limit: int = 15,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     userId로 유저를 검색합니다. 
     검색어가 없으면 전체 유저를 가입순(최신순)으로 나열합니다.
     """
     # 1. 기본 쿼리 생성: 본인 제외
-    query = db.query(User).filter(User.userId != current_user.userId)
+    query = select(User).where(User.userId != current_user.userId)
 
     # 2. userId 검색 조건 추가 (부분 일치 검색)
     if userId_query:
         # User.userId에 검색어가 포함되어 있는지 확인 (LIKE %query%)
-        query = query.filter(User.userId.contains(userId_query))
+        query = query.where(User.userId.contains(userId_query))
 
     # 3. 가입순 정렬 (ID가 클수록 최신 가입자)
     query = query.order_by(User.id.desc())
 
     # 4. 전체 개수 구하기 (페이지네이션 전)
-    total_count = query.count()
+    total_count = (await db.execute(
+        select(func.count()).select_from(query.order_by(None).subquery())
+    )).scalar_one()
 
     # 5. 페이지네이션 적용 (skip, limit)
-    searched_users = query.offset(skip).limit(limit).all()
+    searched_users = (await db.execute(query.offset(skip).limit(limit))).scalars().all()
 
     # 6. 응답 데이터 변환
     result = [
@@ -127,10 +138,7 @@ async def search_users_by_id(
         ) for u in searched_users
     ]
 
-    return {
-        "users": result,
-        "total_count": total_count
-    }
+    return _matchable_user_list_response(result, total_count)
 
 @router.get("/matchable", response_model=MatchableUserListResponse)
 async def get_matchable_users(
@@ -138,14 +146,14 @@ async def get_matchable_users(
     limit: int = 15,
     sort_by: str = Query(None, description="정렬 기준: mbti, interests"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     페이지네이션과 다중 조건 정렬 알고리즘이 적용된 매칭 유저 목록 조회
     """
     # 1. 기본 필터: 본인 제외
-    query = db.query(User).filter(User.userId != current_user.userId)
-    all_users = query.all()
+    query = select(User).where(User.userId != current_user.userId)
+    all_users = (await db.execute(query)).scalars().all()
 
     # 2. 추천 점수 계산 함수 (1순위 기준용)
     def calculate_primary_score(other_user: User):
@@ -192,23 +200,20 @@ async def get_matchable_users(
         ) for u in paginated_users
     ]
 
-    return {
-        "users": result,
-        "total_count": len(all_users)
-    }
+    return _matchable_user_list_response(result, len(all_users))
 
 @router.post("/sync-youtube")
 async def sync_youtube_interests(
     request: dict, # {"access_token": "..."}
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     access_token = request.get("access_token")
     if not access_token:
         raise HTTPException(status_code=400, detail="Google Access Token이 필요합니다.")
     
     # 1. 유튜브에서 구독 채널 이름들 긁어오기
-    channels = fetch_youtube_subscriptions(access_token)
+    channels = await fetch_youtube_subscriptions(access_token)
     if not channels:
         return {"status": "error", "message": "구독 목록을 가져올 수 없거나 목록이 비어있습니다."}
     
@@ -220,8 +225,8 @@ async def sync_youtube_interests(
     # 3. DB 업데이트
     current_user.interests = analysis["interests"]
     
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    await db.refresh(current_user)
     
     return {
         "status": "ok",
@@ -234,9 +239,9 @@ async def sync_youtube_interests(
 async def get_user_compatibility(
     partner_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    partner = db.query(User).filter(User.userId == partner_id).first()
+    partner = (await db.execute(select(User).where(User.userId == partner_id))).scalars().first()
     if not partner:
         raise HTTPException(status_code=404, detail="상대방을 찾을 수 없습니다.")
 
@@ -1,27 +1,41 @@
+import asyncio
 import base64
-import io
 import json
 import os
 import random
 import re
 import uuid
-import wave
 from typing import Annotated
 
+import orjson
 from fastapi import APIRouter, Body, Depends, File, Form, HTTPException, UploadFile
-from pydantic import BaseModel
-from sqlalchemy.orm import Session, load_only
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
 from langchain_core.messages import HumanMessage, SystemMessage
 
+try:
+    from google.genai import types
+except ImportError:  # google-genai 미설치 환경에서도 임포트 가능 (호출 시 오류)
+    types = None
+
+from app.api.auth import get_current_user
 from app.database import get_db
 from app.models.user import User
 from app.models.voice_session import VoiceSession
 from app.models.voice_conversation_turn import VoiceConversationTurn
 from app.models.four_choice_question import FourChoiceQuestion
 from app.models.balance_game_question import BalanceGameQuestion
+from quiz_chain import get_llm
 from ai_agent.prompts import AI_MC_SYSTEM_PROMPT
 from ai_agent.live_context_graph import get_live_context_graph
+from live_bridge import get_genai_client
+from services.cache import LRUCache, content_key
+from services.hedge import first_valid
+from services.voice import pcm_to_wav, text_to_speech_openai_stream
 
 router = APIRouter(tags=["voice"])
 
@@ -37,43 +51,75 @@ AUDIO_MIME_TYPES = {
     "audio/mp4",
 }
 
+# content_type이 비었거나 application/octet-stream일 때 파일 확장자로 MIME 결정 (dict 한 번 조회)
+_EXT_TO_MIME = {
+    ".wav": "audio/wav",
+    ".mp3": "audio/mpeg",
+    ".mpeg": "audio/mpeg",
+    ".ogg": "audio/ogg",
+    ".webm": "audio/webm",
+    ".flac": "audio/flac",
+    ".m4a": "audio/mp4",
+    ".mp4": "audio/mp4",
+}
+_GENERIC_CONTENT_TYPES = frozenset({"", "application/octet-stream"})
+_UNSUPPORTED_EXT_DETAIL = "지원하지 않는 오디오 파일입니다. 지원 확장자: " + ", ".join(sorted(_EXT_TO_MIME))
+
+
+def _resolve_audio_mime(file: UploadFile) -> str:
+    """업로드 파일의 MIME 타입. content_type 우선, 없으면 확장자로 판별 (기본 audio/wav)."""
+    mime_type = (file.content_type or "").strip().lower()
+    if mime_type not in _GENERIC_CONTENT_TYPES:
+        if mime_type not in AUDIO_MIME_TYPES and not mime_type.startswith("audio/"):
+            raise HTTPException(status_code=400, detail=f"지원하지 않는 오디오 타입: {mime_type}")
+        return mime_type
+    if not file.filename:
+        return "audio/wav"
+    ext = os.path.splitext(file.filename)[1].lower()
+    mime_type = _EXT_TO_MIME.get(ext)
+    if mime_type is None:
+        raise HTTPException(status_code=400, detail=_UNSUPPORTED_EXT_DETAIL)
+    return mime_type
+
 # Gemini TTS 출력: 24kHz, 16bit, mono PCM
 TTS_SAMPLE_RATE = 24000
+GEMINI_TTS_MODEL = "gemini-2.5-flash-preview-tts"
+GEMINI_TTS_VOICE = "Kore"
+
+# (모델, 보이스, 텍스트) → base64 WAV. 저장된 밸런스/사지선다 질문처럼 같은 문장 재낭독 시 TTS 호출 생략
+_tts_b64_cache = LRUCache(256)
+# 심리 테스트 질문: 프롬프트(프로필 + 세션 대화 전체 + 방금 발화) 해시 → 질문. 같은 입력의 재요청(재시도·중복 전송)은 LLM 생략
+# 대화가 한 턴이라도 늘거나 발화가 바뀌면 키가 달라지므로 오래된 질문이 재사용되지 않음
+_psych_question_cache = LRUCache(256)
+# 심리 테스트 질문 생성 헤지: 이 시간 안에 응답이 없으면 같은 프롬프트로 한 번 더 요청 (최대 PSYCH_QUESTION_ATTEMPTS번)
+PSYCH_QUESTION_ATTEMPTS = 3
+PSYCH_QUESTION_HEDGE_DELAY = 2.0
 
 
 def _pcm_to_wav_bytes(pcm: bytes, rate: int = TTS_SAMPLE_RATE) -> bytes:
     """16bit mono PCM → WAV 바이트."""
-    buf = io.BytesIO()
-    with wave.open(buf, "wb") as w:
-        w.setnchannels(1)
-        w.setsampwidth(2)
-        w.setframerate(rate)
-        w.writeframes(pcm)
-    return buf.getvalue()
+    return pcm_to_wav(pcm, rate)
 
 
-def _gemini_text_to_speech(text: str) -> bytes:
+async def _gemini_text_to_speech(text: str) -> bytes:
     """
     Gemini TTS: 텍스트 → 음성 PCM (24kHz). 한국어 등 자동 감지.
+    client.aio 비동기 호출이라 합성 대기(수 초) 중에도 이벤트 루프가 /ws 세션 등 다른 요청을 처리.
     """
     if not text.strip():
         return b""
-    from google import genai
-    from google.genai import types
-
-    api_key = os.environ.get("GEMINI_API_KEY")
-    if not api_key:
+    client = get_genai_client()
+    if client is None:
         raise HTTPException(status_code=503, detail="GEMINI_API_KEY not set")
 
-    client = genai.Client(api_key=api_key)
-    response = client.models.generate_content(
-        model="gemini-2.5-flash-preview-tts",
+    response = await client.aio.models.generate_content(
+        model=GEMINI_TTS_MODEL,
         contents=text.strip(),
         config=types.GenerateContentConfig(
             response_modalities=["AUDIO"],
             speech_config=types.SpeechConfig(
                 voice_config=types.VoiceConfig(
-                    prebuilt_voice_config=types.PrebuiltVoiceConfig(voice_name="Kore"),
+                    prebuilt_voice_config=types.PrebuiltVoiceConfig(voice_name=GEMINI_TTS_VOICE),
                 )
             ),
         ),
@@ -88,15 +134,13 @@ def _gemini_text_to_speech(text: str) -> bytes:
     return b""
 
 
-def _gemini_audio_to_transcript(audio_bytes: bytes, mime_type: str) -> str:
+async def _gemini_audio_to_transcript(audio_bytes: bytes, mime_type: str) -> str:
     """
     Gemini 멀티모달 API: 오디오 → 유저 발화 전사(한 줄). 답변 생성은 live_context_graph에서 동일하게 수행.
+    client.aio 비동기 호출이라 전사 대기 중에도 이벤트 루프가 다른 요청을 처리.
     """
-    from google import genai
-    from google.genai import types
-
-    api_key = os.environ.get("GEMINI_API_KEY")
-    if not api_key:
+    client = get_genai_client()
+    if client is None:
         raise HTTPException(status_code=503, detail="GEMINI_API_KEY not set")
 
     system = (
@@ -109,8 +153,7 @@ def _gemini_audio_to_transcript(audio_bytes: bytes, mime_type: str) -> str:
         blob = types.Blob(data=audio_bytes, mime_type=mime_type)
         part = types.Part(inline_data=blob)
 
-    client = genai.Client(api_key=api_key)
-    response = client.models.generate_content(
+    response = await client.aio.models.generate_content(
         model="gemini-2.5-flash",
         contents=[part],
         config=types.GenerateContentConfig(system_instruction=system),
@@ -120,35 +163,44 @@ def _gemini_audio_to_transcript(audio_bytes: bytes, mime_type: str) -> str:
 
 async def _read_audio_and_transcribe(
     file: UploadFile,
-) -> tuple[bytes, str, str]:
-    """공통: 파일 검증 후 바이트·mime_type·전사 텍스트 반환."""
-    mime_type = (file.content_type or "audio/wav").strip().lower()
-    if mime_type not in AUDIO_MIME_TYPES and not mime_type.startswith("audio/"):
-        raise HTTPException(status_code=400, detail=f"지원하지 않는 오디오 타입: {mime_type}")
+) -> str:
+    """
+    공통: 파일 검증 후 전사 텍스트만 반환.
+    오디오 바이트는 호출 측에 돌려주지 않아 요청 처리 동안 업로드 사본이 하나만 유지됨.
+    """
+    mime_type = _resolve_audio_mime(file)
     try:
         audio_bytes = await file.read()
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"파일 읽기 실패: {e}")
+    finally:
+        # 읽은 뒤 바로 SpooledTemporaryFile 정리 (디스크로 넘어간 큰 업로드도 즉시 해제)
+        await file.close()
     if not audio_bytes:
         raise HTTPException(status_code=400, detail="오디오 데이터가 비어 있습니다.")
     try:
-        user_transcript = _gemini_audio_to_transcript(audio_bytes, mime_type)
+        user_transcript = await _gemini_audio_to_transcript(audio_bytes, mime_type)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=502, detail=str(e))
-    return audio_bytes, mime_type, user_transcript
+    return user_transcript
 
 
-def _reply_and_tts(reply: str) -> tuple[str, str]:
-    """reply 텍스트 → TTS 후 base64 WAV, mime_type 반환."""
+async def _reply_and_tts(reply: str) -> tuple[str, str]:
+    """reply 텍스트 → TTS 후 base64 WAV, mime_type 반환. 같은 텍스트는 캐시된 오디오 재사용."""
     audio_b64 = ""
     if reply:
+        key = content_key(GEMINI_TTS_MODEL, GEMINI_TTS_VOICE, reply.strip())
+        cached = _tts_b64_cache.get(key)
+        if cached is not None:
+            return cached, "audio/wav"
         try:
-            pcm = _gemini_text_to_speech(reply)
+            pcm = await _gemini_text_to_speech(reply)
             if pcm:
                 wav_bytes = _pcm_to_wav_bytes(pcm)
                 audio_b64 = base64.b64encode(wav_bytes).decode("ascii")
+                _tts_b64_cache.set(key, audio_b64)
         except HTTPException:
             raise
         except Exception:
@@ -164,7 +216,7 @@ async def first_conversation(
     file: Annotated[UploadFile, File(description="음성 파일 (wav, mp3 등)")],
     user_id_1: Annotated[str, Form(description="참가 유저 ID 1")],
     user_id_2: Annotated[str, Form(description="참가 유저 ID 2")],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     첫 번째 대화. 세션 ID를 생성하고, STT 결과(유저 발화)와 AI 응답 텍스트를 DB에 저장한 뒤
@@ -179,14 +231,14 @@ async def first_conversation(
             user_id_2=user_id_2,
         )
     )
-    db.commit()
+    await db.commit()
 
-    _, _, user_transcript = await _read_audio_and_transcribe(file)
+    user_transcript = await _read_audio_and_transcribe(file)
     # 대화는 이번 유저 발화 하나뿐
     messages = [{"role": "user", "content": user_transcript or ""}]
-    conversation_bytes = json.dumps(messages, ensure_ascii=False).encode("utf-8")
+    conversation_bytes = orjson.dumps(messages)
     graph = get_live_context_graph()
-    out = graph.invoke({"raw_bytes": conversation_bytes})
+    out = await graph.ainvoke({"raw_bytes": conversation_bytes})
     reply = (out.get("reply") or "").strip()
     system_instruction = out.get("system_instruction") or AI_MC_SYSTEM_PROMPT
 
@@ -198,9 +250,9 @@ async def first_conversation(
             assistant_reply=reply,
         )
     )
-    db.commit()
+    await db.commit()
 
-    audio_b64, mime_type = _reply_and_tts(reply)
+    audio_b64, mime_type = await _reply_and_tts(reply)
     payload = {
         "session_id": session_id,
         "reply": reply,
@@ -212,7 +264,7 @@ async def first_conversation(
     if triggered and len(triggered) == 3:
         payload["triggered_game"] = {
             "type": "balance_game",
-            "questions": _balance_game_questions_to_response(session_id, db, triggered),
+            "questions": await _balance_game_questions_to_response(session_id, db, triggered),
         }
     return payload
 
@@ -224,7 +276,7 @@ async def first_conversation(
 async def continue_conversation(
     file: Annotated[UploadFile, File(description="음성 파일 (wav, mp3 등)")],
     session_id: Annotated[str, Form(description="세션 ID (첫 대화 응답에서 받은 값)")],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     두 번째 이후 대화. 반드시 해당 세션의 대화 히스토리 전부를 로드해 AI에 넣고,
@@ -235,23 +287,25 @@ async def continue_conversation(
         raise HTTPException(status_code=400, detail="session_id는 필수입니다.")
 
     first_session = (
-        db.query(VoiceSession)
-        .filter(VoiceSession.session_id == session_id)
-        .order_by(VoiceSession.created_at)
-        .first()
-    )
+        await db.execute(
+            select(VoiceSession)
+            .where(VoiceSession.session_id == session_id)
+            .order_by(VoiceSession.created_at)
+        )
+    ).scalars().first()
     if not first_session:
         raise HTTPException(status_code=400, detail="해당 session_id를 찾을 수 없습니다.")
 
-    _, _, user_transcript = await _read_audio_and_transcribe(file)
+    user_transcript = await _read_audio_and_transcribe(file)
 
     # 해당 세션 대화 히스토리 전부 로드
     turns = (
-        db.query(VoiceConversationTurn)
-        .filter(VoiceConversationTurn.session_id == session_id)
-        .order_by(VoiceConversationTurn.created_at)
-        .all()
-    )
+        await db.execute(
+            select(VoiceConversationTurn)
+            .where(VoiceConversationTurn.session_id == session_id)
+            .order_by(VoiceConversationTurn.created_at, VoiceConversationTurn.id)
+        )
+    ).scalars().all()
     conversation: list[tuple[str, str]] = []
     for t in turns:
         if t.user_text:
@@ -261,9 +315,9 @@ async def continue_conversation(
 
     # 전체 히스토리로 그래프 호출
     messages = [{"role": "user" if r == "user" else "ai", "content": c} for r, c in conversation]
-    conversation_bytes = json.dumps(messages, ensure_ascii=False).encode("utf-8")
+    conversation_bytes = orjson.dumps(messages)
     graph = get_live_context_graph()
-    out = graph.invoke({"raw_bytes": conversation_bytes})
+    out = await graph.ainvoke({"raw_bytes": conversation_bytes})
     reply = (out.get("reply") or "").strip()
     system_instruction = out.get("system_instruction") or AI_MC_SYSTEM_PROMPT
 
@@ -275,9 +329,9 @@ async def continue_conversation(
             assistant_reply=reply,
         )
     )
-    db.commit()
+    await db.commit()
 
-    audio_b64, mime_type = _reply_and_tts(reply)
+    audio_b64, mime_type = await _reply_and_tts(reply)
     payload = {
         "reply": reply,
         "system_instruction": system_instruction,
@@ -288,7 +342,7 @@ async def continue_conversation(
     if triggered and len(triggered) == 3:
         payload["triggered_game"] = {
             "type": "balance_game",
-            "questions": _balance_game_questions_to_response(session_id, db, triggered),
+            "questions": await _balance_game_questions_to_response(session_id, db, triggered),
         }
     return payload
 
@@ -313,7 +367,7 @@ def _user_summary(u: User) -> str:
 async def psych_test(
     file: Annotated[UploadFile, File(description="음성 파일 (wav, mp3 등)")],
     session_id: Annotated[str, Form(description="세션 ID")],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     음성 파일 + 세션 ID 받아서, 해당 세션의 두 유저 정보와 과거 대화 전체를 컨텍스트로 넣고
@@ -325,21 +379,24 @@ async def psych_test(
 
     # 세션에서 user_id 두 개 조회
     first_session = (
-        db.query(VoiceSession)
-        .filter(VoiceSession.session_id == session_id)
-        .order_by(VoiceSession.created_at)
-        .first()
-    )
+        await db.execute(
+            select(VoiceSession)
+            .where(VoiceSession.session_id == session_id)
+            .order_by(VoiceSession.created_at)
+        )
+    ).scalars().first()
     if not first_session:
         raise HTTPException(status_code=400, detail="해당 session_id를 찾을 수 없습니다.")
     user_id_1, user_id_2 = first_session.user_id_1, first_session.user_id_2
 
     # 유저 테이블에서 두 명 정보 조회 (userId 기준). 없으면 무시하고 질문만 생성
-    users = db.query(User).filter(User.userId.in_([user_id_1, user_id_2])).all()
+    users = (
+        await db.execute(select(User).where(User.userId.in_([user_id_1, user_id_2])))
+    ).scalars().all()
     if len(users) != 2:
         try:
-            u1 = db.query(User).filter(User.id == int(user_id_1)).first()
-            u2 = db.query(User).filter(User.id == int(user_id_2)).first()
+            u1 = (await db.execute(select(User).where(User.id == int(user_id_1)))).scalars().first()
+            u2 = (await db.execute(select(User).where(User.id == int(user_id_2)))).scalars().first()
             users = [u for u in (u1, u2) if u is not None]
         except (ValueError, TypeError):
             pass
@@ -352,11 +409,12 @@ async def psych_test(
 
     # 세션 기준 과거 대화 전체
     turns = (
-        db.query(VoiceConversationTurn)
-        .filter(VoiceConversationTurn.session_id == session_id)
-        .order_by(VoiceConversationTurn.created_at)
-        .all()
-    )
+        await db.execute(
+            select(VoiceConversationTurn)
+            .where(VoiceConversationTurn.session_id == session_id)
+            .order_by(VoiceConversationTurn.created_at, VoiceConversationTurn.id)
+        )
+    ).scalars().all()
     history_lines = []
     for t in turns:
         if t.user_text:
@@ -365,7 +423,7 @@ async def psych_test(
     history_block = "\n".join(history_lines) if history_lines else "(아직 대화 없음)"
 
     # 음성 파일 → 전사 (최근 발화 컨텍스트)
-    _, _, recent_transcript = await _read_audio_and_transcribe(file)
+    recent_transcript = await _read_audio_and_transcribe(file)
 
     # MC 역할 + 유저 정보 + 대화 히스토리 + 최근 발화 → 심리 테스트 질문 1개 생성
     system = (
@@ -385,20 +443,30 @@ async def psych_test(
         f"{recent_transcript or '(없음)'}\n\n"
         "위 정보를 바탕으로 MC가 할 심리 테스트 질문 한 문장만 작성하세요."
     )
-    from quiz_chain import get_llm
-
     messages = [
         SystemMessage(content=system),
         HumanMessage(content=user_content),
     ]
-    try:
-        response = get_llm().invoke(messages)
-        question = (response.content if hasattr(response, "content") else str(response)).strip()
-    except Exception as e:
-        raise HTTPException(status_code=502, detail=str(e))
+    cache_key = content_key(system, user_content)
+    question = _psych_question_cache.get(cache_key)
+    if question is None:
+
+        async def generate_question() -> str:
+            response = await get_llm().ainvoke(messages)
+            return (response.content if hasattr(response, "content") else str(response)).strip()
+
+        # 느린 응답·빈 응답 한 번이 요청 전체를 늦추지 않도록 헤지 (먼저 온 비어 있지 않은 질문 사용)
+        try:
+            question = await first_valid(
+                generate_question, attempts=PSYCH_QUESTION_ATTEMPTS, delay=PSYCH_QUESTION_HEDGE_DELAY
+            ) or ""
+        except Exception as e:
+            raise HTTPException(status_code=502, detail=str(e))
+        if question:
+            _psych_question_cache.set(cache_key, question)
 
     # 질문 텍스트 → TTS 음성
-    audio_b64, mime_type = _reply_and_tts(question)
+    audio_b64, mime_type = await _reply_and_tts(question)
 
     return {
         "question": question,
@@ -434,7 +502,7 @@ async def psych_test_result(
     session_id: Annotated[str, Form(description="세션 ID")],
     file_1: Annotated[UploadFile, File(description="참가자 1 대화 내역 음성 파일")],
     file_2: Annotated[UploadFile, File(description="참가자 2 대화 내역 음성 파일")],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     세션 ID + 대화 내역 음성 파일 2개를 받아, 두 참가자의 심리 테스트 응답을 전사하고
@@ -445,17 +513,20 @@ async def psych_test_result(
     if not session_id:
         raise HTTPException(status_code=400, detail="session_id는 필수입니다.")
 
-    # 음성 2개 전사
-    _, _, transcript_1 = await _read_audio_and_transcribe(file_1)
-    _, _, transcript_2 = await _read_audio_and_transcribe(file_2)
+    # 음성 2개 전사 (동시 실행)
+    transcript_1, transcript_2 = await asyncio.gather(
+        _read_audio_and_transcribe(file_1),
+        _read_audio_and_transcribe(file_2),
+    )
 
     # 세션 대화 히스토리 (선택 컨텍스트)
     turns = (
-        db.query(VoiceConversationTurn)
-        .filter(VoiceConversationTurn.session_id == session_id)
-        .order_by(VoiceConversationTurn.created_at)
-        .all()
-    )
+        await db.execute(
+            select(VoiceConversationTurn)
+            .where(VoiceConversationTurn.session_id == session_id)
+            .order_by(VoiceConversationTurn.created_at, VoiceConversationTurn.id)
+        )
+    ).scalars().all()
     history_lines = []
     for t in turns:
         if t.user_text:
@@ -463,8 +534,6 @@ async def psych_test_result(
         history_lines.append(f"- ai: {t.assistant_reply or ''}")
     history_block = "\n".join(history_lines) if history_lines else "(없음)"
 
-    from quiz_chain import get_llm
-
     system = (
         f"{AI_MC_SYSTEM_PROMPT.strip()}\n\n"
         "역할: 당신은 **MC**이자 **심리 테스트 분석가**입니다. "
@@ -487,7 +556,7 @@ async def psych_test_result(
         HumanMessage(content=user_content),
     ]
     try:
-        response = get_llm().invoke(messages)
+        response = await get_llm().ainvoke(messages)
         raw = (response.content if hasattr(response, "content") else str(response)).strip()
     except Exception as e:
         raise HTTPException(status_code=502, detail=str(e))
@@ -495,7 +564,7 @@ async def psych_test_result(
     score, result_text = _parse_score_and_result(raw)
 
     # 결과 텍스트 → TTS 음성
-    audio_b64, mime_type = _reply_and_tts(result_text)
+    audio_b64, mime_type = await _reply_and_tts(result_text)
 
     return {
         "score": score,
@@ -508,6 +577,16 @@ async def psych_test_result(
 # ----- 4지 선다 퀴즈 질문 생성: 세션 → 유저 interests/이름 기반 상대방 퀴즈, DB 저장 + 음성 -----
 
 
+_FOUR_CHOICE_SYSTEM = (
+    "당신은 소개팅/미팅 MC입니다. 주어진 참가자(이름, 관심사)에 대한 **4지 선다 퀴즈**를 하나 만드세요. "
+    "관심사를 활용해 그 사람을 맞히는 재미있는 질문으로. "
+    "반드시 아래 형식으로만 출력하세요.\n"
+    "QUESTION: (질문 원본 한 문장)\n"
+    "CORRECT: (정답 한 개)\n"
+    "WRONG1: (오답 1)\nWRONG2: (오답 2)\nWRONG3: (오답 3)"
+)
+
+
 def _parse_four_choice(llm_output: str) -> tuple[str, str, str, str, str] | None:
     """LLM 출력에서 QUESTION, CORRECT, WRONG1, WRONG2, WRONG3 파싱. 실패 시 None."""
     text = (llm_output or "").strip()
@@ -531,7 +610,7 @@ def _parse_four_choice(llm_output: str) -> tuple[str, str, str, str, str] | None
 @router.post("/four-choice-quiz")
 async def four_choice_quiz(
     session_id: Annotated[str, Form(description="세션 ID")],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     세션 ID로 두 유저를 조회한 뒤, 각자의 interests·이름을 활용해
@@ -543,20 +622,23 @@ async def four_choice_quiz(
         raise HTTPException(status_code=400, detail="session_id는 필수입니다.")
 
     first_session = (
-        db.query(VoiceSession)
-        .filter(VoiceSession.session_id == session_id)
-        .order_by(VoiceSession.created_at)
-        .first()
-    )
+        await db.execute(
+            select(VoiceSession)
+            .where(VoiceSession.session_id == session_id)
+            .order_by(VoiceSession.created_at)
+        )
+    ).scalars().first()
     if not first_session:
         raise HTTPException(status_code=400, detail="해당 session_id를 찾을 수 없습니다.")
     user_id_1, user_id_2 = first_session.user_id_1, first_session.user_id_2
 
-    users = db.query(User).filter(User.userId.in_([user_id_1, user_id_2])).all()
+    users = (
+        await db.execute(select(User).where(User.userId.in_([user_id_1, user_id_2])))
+    ).scalars().all()
     if len(users) != 2:
         try:
-            u1 = db.query(User).filter(User.id == int(user_id_1)).first()
-            u2 = db.query(User).filter(User.id == int(user_id_2)).first()
+            u1 = (await db.execute(select(User).where(User.id == int(user_id_1)))).scalars().first()
+            u2 = (await db.execute(select(User).where(User.id == int(user_id_2)))).scalars().first()
             users = [u for u in (u1, u2) if u is not None]
         except (ValueError, TypeError):
             pass
@@ -575,85 +657,60 @@ async def four_choice_quiz(
         name1, name2 = "참가자1", "참가자2"
         interests1_str = interests2_str = "일반"
 
-    from quiz_chain import get_llm
-
-    def generate_one_question(about_name: str, about_interests: str) -> tuple[str, str, str, str, str] | None:
-        system = (
-            "당신은 소개팅/미팅 MC입니다. 주어진 참가자(이름, 관심사)에 대한 **4지 선다 퀴즈**를 하나 만드세요. "
-            "관심사를 활용해 그 사람을 맞히는 재미있는 질문으로. "
-            "반드시 아래 형식으로만 출력하세요.\n"
-            "QUESTION: (질문 원본 한 문장)\n"
-            "CORRECT: (정답 한 개)\n"
-            "WRONG1: (오답 1)\nWRONG2: (오답 2)\nWRONG3: (오답 3)"
-        )
+    def question_messages(about_name: str, about_interests: str) -> list:
         user_content = f"참가자 이름: {about_name}\n관심사: {about_interests}\n\n위 참가자에 대한 4지 선다 퀴즈 하나를 QUESTION/CORRECT/WRONG1~3 형식으로 출력하세요."
-        messages = [SystemMessage(content=system), HumanMessage(content=user_content)]
-        try:
-            response = get_llm().invoke(messages)
-            raw = (response.content if hasattr(response, "content") else str(response)).strip()
-            return _parse_four_choice(raw)
-        except Exception:
-            return None
+        return [SystemMessage(content=_FOUR_CHOICE_SYSTEM), HumanMessage(content=user_content)]
 
-    results = []
     # 퀴즈 1: user2에 대한 퀴즈 (user1이 풀 때 상대방 이름 = name2)
-    parsed1 = generate_one_question(name2, interests2_str)
-    if parsed1:
-        q_id_1 = str(uuid.uuid4())
-        q_text_1, correct_1, wrong1_1, wrong2_1, wrong3_1 = parsed1
-        db.add(
-            FourChoiceQuestion(
-                question_id=q_id_1,
-                session_id=session_id,
-                question_text=q_text_1,
-                correct_answer=correct_1,
-                wrong_answer_1=wrong1_1,
-                wrong_answer_2=wrong2_1,
-                wrong_answer_3=wrong3_1,
-                about_user_name=name2,
-            )
-        )
-        db.commit()
-        choices_1 = [{"text": correct_1, "is_correct": True}, {"text": wrong1_1, "is_correct": False}, {"text": wrong2_1, "is_correct": False}, {"text": wrong3_1, "is_correct": False}]
-        random.shuffle(choices_1)
-        tts_text_1 = f"{name2}에 대한 퀴즈입니다. {q_text_1}"
-        audio_1, mime_1 = _reply_and_tts(tts_text_1)
-        results.append({
-            "question_id": q_id_1,
-            "question_text": q_text_1,
-            "choices": choices_1,
-            "audio": audio_1,
-            "mime_type": mime_1,
-        })
     # 퀴즈 2: user1에 대한 퀴즈 (user2가 풀 때 상대방 이름 = name1)
-    parsed2 = generate_one_question(name1, interests1_str)
-    if parsed2:
-        q_id_2 = str(uuid.uuid4())
-        q_text_2, correct_2, wrong1_2, wrong2_2, wrong3_2 = parsed2
+    # 같은 프롬프트 틀의 독립 호출 → abatch 한 번으로 동시 실행 (실패한 항목만 건너뜀)
+    about_names = (name2, name1)
+    responses = await get_llm().abatch(
+        [question_messages(name2, interests2_str), question_messages(name1, interests1_str)],
+        config={"max_concurrency": len(about_names)},
+        return_exceptions=True,
+    )
+    parsed_list = [
+        None if isinstance(r, Exception) else _parse_four_choice(str(getattr(r, "content", r)).strip())
+        for r in responses
+    ]
+
+    generated = []
+    for about_name, parsed in zip(about_names, parsed_list):
+        if not parsed:
+            continue
+        q_id = str(uuid.uuid4())
+        q_text, correct, wrong1, wrong2, wrong3 = parsed
         db.add(
             FourChoiceQuestion(
-                question_id=q_id_2,
+                question_id=q_id,
                 session_id=session_id,
-                question_text=q_text_2,
-                correct_answer=correct_2,
-                wrong_answer_1=wrong1_2,
-                wrong_answer_2=wrong2_2,
-                wrong_answer_3=wrong3_2,
-                about_user_name=name1,
+                question_text=q_text,
+                correct_answer=correct,
+                wrong_answer_1=wrong1,
+                wrong_answer_2=wrong2,
+                wrong_answer_3=wrong3,
+                about_user_name=about_name,
             )
         )
-        db.commit()
-        choices_2 = [{"text": correct_2, "is_correct": True}, {"text": wrong1_2, "is_correct": False}, {"text": wrong2_2, "is_correct": False}, {"text": wrong3_2, "is_correct": False}]
-        random.shuffle(choices_2)
-        tts_text_2 = f"{name1}에 대한 퀴즈입니다. {q_text_2}"
-        audio_2, mime_2 = _reply_and_tts(tts_text_2)
-        results.append({
-            "question_id": q_id_2,
-            "question_text": q_text_2,
-            "choices": choices_2,
-            "audio": audio_2,
-            "mime_type": mime_2,
-        })
+        choices = [{"text": correct, "is_correct": True}, {"text": wrong1, "is_correct": False}, {"text": wrong2, "is_correct": False}, {"text": wrong3, "is_correct": False}]
+        random.shuffle(choices)
+        generated.append((q_id, q_text, choices, f"{about_name}에 대한 퀴즈입니다. {q_text}"))
+    if generated:
+        await db.commit()
+
+    # 질문 음성도 동시에 합성
+    tts_results = await asyncio.gather(*(_reply_and_tts(tts_text) for _, _, _, tts_text in generated))
+    results = [
+        {
+            "question_id": q_id,
+            "question_text": q_text,
+            "choices": choices,
+            "audio": audio_b64,
+            "mime_type": mime_type,
+        }
+        for (q_id, q_text, choices, _), (audio_b64, mime_type) in zip(generated, tts_results)
+    ]
 
     if not results:
         raise HTTPException(status_code=502, detail="퀴즈 생성에 실패했습니다.")
@@ -687,14 +744,12 @@ def _parse_balance_game_three(llm_output: str) -> list[tuple[str, str, str]] | N
     return result if len(result) == 3 else None
 
 
-def _generate_balance_game_questions_impl(
+async def _generate_balance_game_questions_impl(
     session_id: str,
-    db: Session,
+    db: AsyncSession,
     history_block: str,
 ) -> list[dict]:
     """세션 ID, DB, 대화 맥락 문자열을 받아 밸런스 게임 질문 3개 생성·DB 저장·TTS 후 결과 리스트 반환."""
-    from quiz_chain import get_llm
-
     system = (
         "당신은 소개팅/미팅 MC입니다. **밸런스 게임** 질문 3개를 만드세요. "
         "각 질문은 'A vs B' 형태로 두 가지 중 하나를 고르는 재미있는 질문이어야 합니다. "
@@ -710,7 +765,7 @@ def _generate_balance_game_questions_impl(
         "위 대화 맥락을 활용해 참가자들이 고르기 좋은 밸런스 게임 질문 3개를 Q1/OPTION_A/OPTION_B 형식으로 출력하세요."
     )
     messages = [SystemMessage(content=system), HumanMessage(content=user_content)]
-    response = get_llm().invoke(messages)
+    response = await get_llm().ainvoke(messages)
     raw = (response.content if hasattr(response, "content") else str(response)).strip()
 
     parsed = _parse_balance_game_three(raw)
@@ -744,10 +799,10 @@ def _generate_balance_game_questions_impl(
                 option_b=opt_b,
             )
         )
-        db.commit()
+        await db.commit()
         order = ["첫 번째", "두 번째", "세 번째"][idx]
         tts_sentence = f"{order}. {q_text}"
-        audio_b64, mime_type = _reply_and_tts(tts_sentence)
+        audio_b64, mime_type = await _reply_and_tts(tts_sentence)
         results.append({
             "question_id": q_id,
             "question_text": q_text,
@@ -759,9 +814,9 @@ def _generate_balance_game_questions_impl(
     return results
 
 
-def _balance_game_questions_to_response(
+async def _balance_game_questions_to_response(
     session_id: str,
-    db: Session,
+    db: AsyncSession,
     questions: list[tuple[str, str, str]],
 ) -> list[dict]:
     """에이전트가 트리거한 질문 3개 (q_text, option_a, option_b)를 DB 저장 + TTS 후 프론트용 리스트로 반환."""
@@ -779,10 +834,10 @@ def _balance_game_questions_to_response(
                 option_b=opt_b,
             )
         )
-        db.commit()
+        await db.commit()
         order = ["첫 번째", "두 번째", "세 번째"][idx]
         tts_sentence = f"{order}. {q_text}"
-        audio_b64, mime_type = _reply_and_tts(tts_sentence)
+        audio_b64, mime_type = await _reply_and_tts(tts_sentence)
         results.append({
             "question_id": q_id,
             "question_text": q_text,
@@ -803,7 +858,7 @@ class TriggerBalanceGameRequest(BaseModel):
 @router.post("/balance-game/trigger")
 async def trigger_balance_game(
     body: TriggerBalanceGameRequest = Body(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     프론트에서 밸런스 게임 버튼 등으로 게임을 트리거할 때 호출합니다.
@@ -815,11 +870,12 @@ async def trigger_balance_game(
         raise HTTPException(status_code=400, detail="session_id는 필수입니다.")
 
     turns = (
-        db.query(VoiceConversationTurn)
-        .filter(VoiceConversationTurn.session_id == session_id)
-        .order_by(VoiceConversationTurn.created_at)
-        .all()
-    )
+        await db.execute(
+            select(VoiceConversationTurn)
+            .where(VoiceConversationTurn.session_id == session_id)
+            .order_by(VoiceConversationTurn.created_at, VoiceConversationTurn.id)
+        )
+    ).scalars().all()
     history_lines = []
     for t in turns:
         if t.user_text:
@@ -829,7 +885,7 @@ async def trigger_balance_game(
     if body.additional_context and body.additional_context.strip():
         history_block = history_block + "\n\n[추가 맥락]\n" + body.additional_context.strip()
 
-    results = _generate_balance_game_questions_impl(session_id, db, history_block)
+    results = await _generate_balance_game_questions_impl(session_id, db, history_block)
     return {"questions": results}
 
 
@@ -837,7 +893,7 @@ async def trigger_balance_game(
 async def balance_game_questions(
     session_id: Annotated[str, Form(description="세션 ID")],
     conversation_audio: Annotated[UploadFile | None, File(description="추가 대화 내용 음성 파일 (선택)")] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     세션 ID를 받고, 선택적으로 추가 대화 내용 음성 파일을 받습니다. 해당 세션의 예전 대화를 검색해 활용하고
@@ -849,11 +905,12 @@ async def balance_game_questions(
         raise HTTPException(status_code=400, detail="session_id는 필수입니다.")
 
     turns = (
-        db.query(VoiceConversationTurn)
-        .filter(VoiceConversationTurn.session_id == session_id)
-        .order_by(VoiceConversationTurn.created_at)
-        .all()
-    )
+        await db.execute(
+            select(VoiceConversationTurn)
+            .where(VoiceConversationTurn.session_id == session_id)
+            .order_by(VoiceConversationTurn.created_at, VoiceConversationTurn.id)
+        )
+    ).scalars().all()
     history_lines = []
     for t in turns:
         if t.user_text:
@@ -862,7 +919,7 @@ async def balance_game_questions(
     history_block = "\n".join(history_lines) if history_lines else "(아직 대화 없음)"
     if conversation_audio:
         try:
-            _, _, transcript = await _read_audio_and_transcribe(conversation_audio)
+            transcript = await _read_audio_and_transcribe(conversation_audio)
             if transcript and transcript.strip():
                 history_block = history_block + "\n\n[추가 대화]\n" + transcript.strip()
         except HTTPException:
@@ -870,7 +927,7 @@ async def balance_game_questions(
         except Exception:
             pass
 
-    results = _generate_balance_game_questions_impl(session_id, db, history_block)
+    results = await _generate_balance_game_questions_impl(session_id, db, history_block)
     return {"questions": results}
 
 
@@ -898,16 +955,16 @@ async def balance_game_result(
     q2 = (question_text_2 or "").strip() or "질문2"
     q3 = (question_text_3 or "").strip() or "질문3"
 
-    # 정답 음성 3개 전사
-    _, _, answer_1 = await _read_audio_and_transcribe(file_1)
-    _, _, answer_2 = await _read_audio_and_transcribe(file_2)
-    _, _, answer_3 = await _read_audio_and_transcribe(file_3)
+    # 정답 음성 3개 전사 (동시 실행)
+    answer_1, answer_2, answer_3 = await asyncio.gather(
+        _read_audio_and_transcribe(file_1),
+        _read_audio_and_transcribe(file_2),
+        _read_audio_and_transcribe(file_3),
+    )
     answer_1 = (answer_1 or "").strip()
     answer_2 = (answer_2 or "").strip()
     answer_3 = (answer_3 or "").strip()
 
-    from quiz_chain import get_llm
-
     system = (
         "당신은 소개팅/미팅 MC이자 궁합 분석가입니다. "
         "참가자 두 명이 밸런스 게임 3개에 답한 내용을 바탕으로, "
@@ -922,12 +979,12 @@ async def balance_game_result(
     )
     messages = [SystemMessage(content=system), HumanMessage(content=user_content)]
     try:
-        response = get_llm().invoke(messages)
+        response = await get_llm().ainvoke(messages)
         result_text = (response.content if hasattr(response, "content") else str(response)).strip()
     except Exception as e:
         raise HTTPException(status_code=502, detail=str(e))
 
-    audio_b64, mime_type = _reply_and_tts(result_text)
+    audio_b64, mime_type = await _reply_and_tts(result_text)
 
     return {
         "result_text": result_text,
@@ -944,7 +1001,7 @@ async def quiz_result(
     file: Annotated[UploadFile, File(description="유저 음성 파일 (선택한 답)")],
     question_id: Annotated[str, Form(description="퀴즈 ID (four_choice_questions.question_id)")],
     session_id: Annotated[str, Form(description="세션 ID")],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     유저 음성 파일 + 퀴즈 ID + 세션 ID를 받아, 퀴즈 ID로 질문·정답을 조회하고
@@ -958,23 +1015,21 @@ async def quiz_result(
         raise HTTPException(status_code=400, detail="session_id는 필수입니다.")
 
     quiz = (
-        db.query(FourChoiceQuestion)
-        .filter(
-            FourChoiceQuestion.question_id == question_id,
-            FourChoiceQuestion.session_id == session_id,
+        await db.execute(
+            select(FourChoiceQuestion).where(
+                FourChoiceQuestion.question_id == question_id,
+                FourChoiceQuestion.session_id == session_id,
+            )
         )
-        .first()
-    )
+    ).scalars().first()
     if not quiz:
         raise HTTPException(status_code=404, detail="해당 퀴즈를 찾을 수 없습니다.")
 
-    _, _, user_answer = await _read_audio_and_transcribe(file)
+    user_answer = await _read_audio_and_transcribe(file)
     user_answer = (user_answer or "").strip()
     correct_answer = (quiz.correct_answer or "").strip()
 
     # 정답 여부: 전사 내용이 정답과 의미적으로 일치하면 O (LLM으로 판정)
-    from quiz_chain import get_llm
-
     is_correct = False
     if user_answer and correct_answer:
         judge_prompt = (
@@ -984,7 +1039,7 @@ async def quiz_result(
             "참가자가 정답을 맞혔으면 O, 틀렸으면 X만 한 글자로 출력하세요. (동의어·줄임말도 정답으로 인정)"
         )
         try:
-            response = get_llm().invoke([HumanMessage(content=judge_prompt)])
+            response = await get_llm().ainvoke([HumanMessage(content=judge_prompt)])
             out = (response.content if hasattr(response, "content") else str(response)).strip().upper()
             is_correct = out.startswith("O") and "X" not in out[:2]
         except Exception:
@@ -1032,7 +1087,7 @@ class ChemistryResultRequest(BaseModel):
 @router.post("/chemistry-result")
 async def chemistry_result(
     body: ChemistryResultRequest = Body(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     세션 ID를 받아, 해당 세션의 과거 대화 히스토리와 두 참가자 프로필을 바탕으로
@@ -1043,19 +1098,20 @@ async def chemistry_result(
         raise HTTPException(status_code=400, detail="session_id는 필수입니다.")
 
     session = (
-        db.query(VoiceSession)
-        .filter(VoiceSession.session_id == session_id)
-        .first()
-    )
+        await db.execute(
+            select(VoiceSession).where(VoiceSession.session_id == session_id)
+        )
+    ).scalars().first()
     if not session:
         raise HTTPException(status_code=404, detail="해당 세션을 찾을 수 없습니다.")
 
     turns = (
-        db.query(VoiceConversationTurn)
-        .filter(VoiceConversationTurn.session_id == session_id)
-        .order_by(VoiceConversationTurn.created_at)
-        .all()
-    )
+        await db.execute(
+            select(VoiceConversationTurn)
+            .where(VoiceConversationTurn.session_id == session_id)
+            .order_by(VoiceConversationTurn.created_at, VoiceConversationTurn.id)
+        )
+    ).scalars().all()
     history_lines = []
     for t in turns:
         if t.user_text:
@@ -1065,22 +1121,22 @@ async def chemistry_result(
     history_block = "\n".join(history_lines) if history_lines else "(대화 내역 없음)"
 
     user_1 = (
-        db.query(User)
-        .options(load_only(User.userId, User.name, User.gender, User.age, User.interests, User.mbti, User.bio, User.profile_image_url))
-        .filter(User.userId == session.user_id_1)
-        .first()
-    )
+        await db.execute(
+            select(User)
+            .options(load_only(User.userId, User.name, User.gender, User.age, User.interests, User.mbti, User.bio, User.profile_image_url))
+            .where(User.userId == session.user_id_1)
+        )
+    ).scalars().first()
     user_2 = (
-        db.query(User)
-        .options(load_only(User.userId, User.name, User.gender, User.age, User.interests, User.mbti, User.bio, User.profile_image_url))
-        .filter(User.userId == session.user_id_2)
-        .first()
-    )
+        await db.execute(
+            select(User)
+            .options(load_only(User.userId, User.name, User.gender, User.age, User.interests, User.mbti, User.bio, User.profile_image_url))
+            .where(User.userId == session.user_id_2)
+        )
+    ).scalars().first()
     profile_1 = _user_to_profile_dict(user_1) if user_1 else None
     profile_2 = _user_to_profile_dict(user_2) if user_2 else None
 
-    from quiz_chain import get_llm
-
     profile_1_str = json.dumps(profile_1, ensure_ascii=False) if profile_1 else "정보 없음"
     profile_2_str = json.dumps(profile_2, ensure_ascii=False) if profile_2 else "정보 없음"
 
@@ -1099,7 +1155,7 @@ async def chemistry_result(
     )
     messages = [SystemMessage(content=system), HumanMessage(content=user_content)]
     try:
-        response = get_llm().invoke(messages)
+        response = await get_llm().ainvoke(messages)
         raw = (response.content if hasattr(response, "content") else str(response)).strip()
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"케미 분석 생성 실패: {e}")
@@ -1124,7 +1180,7 @@ async def chemistry_result(
         f"두 분의 케미 분석 결과입니다. {summary} "
         f"케미 지수는 {chemistry_percent}퍼센트입니다."
     )
-    audio_b64, mime_type = _reply_and_tts(full_script)
+    audio_b64, mime_type = await _reply_and_tts(full_script)
 
     return {
         "summary": summary,
@@ -1133,4 +1189,44 @@ async def chemistry_result(
         "mime_type": mime_type,
         "user_1_profile": profile_1,
         "user_2_profile": profile_2,
-    }
\ No newline at end of file
+    }
+
+
+# ----- 텍스트 음성 합성 (OpenAI TTS 스트리밍) -----
+
+
+class TTSRequest(BaseModel):
+    text: str = Field(max_length=4096)  # OpenAI TTS 입력 상한
+
+
+@router.post("/tts")
+async def text_to_speech(
+    request: TTSRequest,
+    current_user: User = Depends(get_current_user),  # 유료 TTS 호출이라 로그인 사용자만
+) -> StreamingResponse:
+    """
+    텍스트를 WAV로 합성해 받는 대로 청크 스트리밍 (합성 완료를 기다리지 않고 재생 시작 가능).
+    임의 텍스트라 캐시하지 않음. 첫 청크까지 받은 뒤 응답을 시작하므로 합성 실패는 502/503으로 반환.
+    """
+    text = request.text.strip()
+    if not text:
+        raise HTTPException(status_code=400, detail="text가 비어 있습니다.")
+    if not os.environ.get("OPENAI_API_KEY"):
+        raise HTTPException(status_code=503, detail="OPENAI_API_KEY not set")
+
+    stream = text_to_speech_openai_stream(text)
+    try:
+        first = await anext(stream, b"")
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+    async def body():
+        try:
+            if first:
+                yield first
+            async for chunk in stream:
+                yield chunk
+        finally:
+            await stream.aclose()
+
+    return StreamingResponse(body(), media_type="audio/wav")
@@ -1,52 +1,246 @@
 import asyncio
-import json
 import base64
+import logging
+import re
+import time
+from functools import lru_cache
 from uuid import uuid4
+
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from services.voice import speech_to_text_gemini, text_to_speech_openai
-from services.agent import get_app_runnable
+from services.voice import (
+    speech_to_text_gemini,
+    text_to_speech_cached,
+    text_to_speech_openai_stream,
+    text_to_speech_stream_cached,
+)
+from services.agent import FALLBACK_REPLY, compact_messages, get_app_runnable, quiz_tts_phrases
 from ai_agent.live_context_graph import get_system_instruction_from_conversation_bytes
-from live_bridge import run_live_session
+from live_bridge import encode_frame, run_live_session, send_json_frame
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/ws", tags=["websocket"])
 
+# /ws/live 첫 질문 TTS 캐시: 질문 텍스트 → (WAV bytes, base64). quiz_data가 바뀌면 키가 달라져 자동 갱신
+_first_question_audio: dict[str, tuple[bytes, str]] = {}
+# 사전 합성 중에 들어온 연결이 같은 질문을 중복 합성하지 않도록 직렬화
+_first_question_lock = asyncio.Lock()
+
+# 문장 경계 (마침표·물음표·느낌표 뒤 공백, 또는 줄바꿈 — 채점 피드백과 다음 질문은 줄바꿈으로 이어짐)
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?。？！])\s+|\n+")
+# 미리 합성해 둘 문장 TTS 최대 개수 (메모리 상한)
+_TTS_PREFETCH = 3
+# ai_delta 전송 간격: 100ms가 지났거나 글자가 이만큼 모이면 한 프레임으로 묶어 전송
+_DELTA_INTERVAL = 0.1
+_DELTA_MIN_CHARS = 24
+
+# 문장 오디오 앞뒤 고정 제어 프레임 (문장마다 재직렬화하지 않음)
+_FRAME_AUDIO_START = encode_frame({"type": "audio_start", "mime_type": "audio/wav"})
+_FRAME_AUDIO_END = encode_frame({"type": "audio_end"})
+
+
+async def _iter_streamed_sentences(text_queue: asyncio.Queue):
+    """
+    LLM 토큰 스트림(text_queue, 종료 시 None)을 받아 문장이 완성될 때마다 yield.
+    응답 전체를 기다리지 않고 첫 문장부터 TTS를 시작하기 위함.
+    """
+    buf = ""
+    while (chunk := await text_queue.get()) is not None:
+        buf += chunk
+        parts = _SENTENCE_SPLIT_RE.split(buf)
+        # 마지막 조각은 아직 끝나지 않은 문장일 수 있으므로 남겨 둠
+        for sentence in parts[:-1]:
+            sentence = sentence.strip()
+            if sentence:
+                yield sentence
+        buf = parts[-1]
+    if buf.strip():
+        yield buf.strip()
+
+
+@lru_cache(maxsize=1)
+def quiz_tts_sentences() -> frozenset[str]:
+    """퀴즈 고정 문구를 _iter_streamed_sentences와 같은 기준으로 나눈 문장 집합 (TTS 캐시 대상·사전 합성용)."""
+    return frozenset(
+        sentence.strip()
+        for phrase in quiz_tts_phrases()
+        for sentence in _SENTENCE_SPLIT_RE.split(phrase)
+        if sentence.strip()
+    )
+
+
+async def _pump_tts_stream(sentence: str, chunks: asyncio.Queue) -> None:
+    """
+    문장 하나의 스트리밍 TTS 청크를 chunks에 넣음 (끝나거나 실패하면 None으로 종료 표시).
+    고정 문구 문장만 캐시 경로로 — LLM이 만든 자유 문장은 재사용되지 않으므로 캐시(LRU·Redis)에 넣지 않음.
+    """
+    tts = text_to_speech_stream_cached if sentence in quiz_tts_sentences() else text_to_speech_openai_stream
+    try:
+        async for chunk in tts(sentence):
+            chunks.put_nowait(chunk)
+    finally:
+        chunks.put_nowait(None)
+
+
+async def _send_tts_pipelined(websocket: WebSocket, sentences) -> None:
+    """
+    문장별 TTS 파이프라인: producer가 문장마다 스트리밍 TTS 태스크를 먼저 시작하고(최대 _TTS_PREFETCH개 대기),
+    consumer(현재 코루틴)는 문장 순서대로 audio_start → binary 청크(도착하는 대로) → audio_end로 전송.
+    앞 문장을 보내는 동안 뒤 문장은 합성되어 청크가 쌓임 (캐시 적중 시 전체 WAV 한 청크).
+    sentences: 문장 async iterable (그래프 출력이 이어지는 동안 계속 공급될 수 있음)
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=_TTS_PREFETCH)
+
+    async def produce():
+        async for sentence in sentences:
+            chunks: asyncio.Queue = asyncio.Queue()
+            task = asyncio.create_task(_pump_tts_stream(sentence, chunks))
+            try:
+                await queue.put((task, chunks))
+            except asyncio.CancelledError:
+                task.cancel()
+                raise
+        await queue.put(None)
+
+    producer = asyncio.create_task(produce())
+    task = None  # 현재 전송 중인 문장의 TTS 태스크 (연결 끊김 등으로 중단되면 함께 취소)
+    try:
+        while (item := await queue.get()) is not None:
+            task, chunks = item
+            await websocket.send_text(_FRAME_AUDIO_START)
+            while (chunk := await chunks.get()) is not None:
+                await websocket.send_bytes(chunk)
+            await task  # 합성 중 오류가 있었으면 여기서 전파
+            await websocket.send_text(_FRAME_AUDIO_END)
+        await producer
+    finally:
+        producer.cancel()
+        if task is not None:
+            task.cancel()
+        while not queue.empty():
+            item = queue.get_nowait()
+            if item is not None:
+                item[0].cancel()
+
+
+async def _stream_agent_turn(
+    websocket: WebSocket, runnable, transcript: str, config: dict, text_queue: asyncio.Queue, send_interim: bool
+) -> tuple[str, bool]:
+    """
+    에이전트를 astream_events(v2)로 실행. chat 노드의 LLM 토큰은 text_queue에 넣어 문장 TTS가 바로 시작되게 하고,
+    send_interim이면 {"type":"ai_delta"}로도 전송 (구독하지 않은 클라이언트는 직렬화·전송 생략).
+    반환: (최종 AI 응답 텍스트, 토큰 스트리밍 여부)
+    """
+    result = {}
+    streamed = False
+    pending: list[str] = []  # 아직 보내지 않은 ai_delta 조각
+    pending_len = 0
+    last_sent = time.monotonic()
+    async for ev in runnable.astream_events({"messages": [("user", transcript)]}, config=config, version="v2"):
+        kind = ev["event"]
+        if kind == "on_chat_model_stream" and ev["metadata"].get("langgraph_node") == "chat":
+            text = ev["data"]["chunk"].content
+            if isinstance(text, str) and text:
+                streamed = True
+                text_queue.put_nowait(text)  # TTS 문장 분리는 지연 없이
+                if not send_interim:
+                    continue
+                pending.append(text)
+                pending_len += len(text)
+                now = time.monotonic()
+                if pending_len >= _DELTA_MIN_CHARS or now - last_sent >= _DELTA_INTERVAL:
+                    await send_json_frame(websocket, {"type": "ai_delta", "text": "".join(pending)})
+                    pending.clear()
+                    pending_len = 0
+                    last_sent = now
+        elif kind == "on_chain_end" and not ev.get("parent_ids"):
+            # 루트 그래프 종료 이벤트의 output = 최종 상태
+            result = ev["data"].get("output") or {}
+    if pending:
+        await send_json_frame(websocket, {"type": "ai_delta", "text": "".join(pending)})
+    return result.get("last_ai") or FALLBACK_REPLY, streamed
+
+
+async def _run_agent_turn(
+    websocket: WebSocket, runnable, transcript: str, config: dict, send_interim: bool = False
+) -> None:
+    """
+    한 턴 실행: LLM 토큰 스트림을 문장 단위로 끊어 생성과 동시에 TTS 전송.
+    스트리밍이 없던 응답(퀴즈 고정 문구, LLM 캐시 적중)은 완료 후 전체 텍스트로 TTS.
+    """
+    text_queue: asyncio.Queue = asyncio.Queue()
+    tts_task = asyncio.create_task(_send_tts_pipelined(websocket, _iter_streamed_sentences(text_queue)))
+    try:
+        ai_text, streamed = await _stream_agent_turn(
+            websocket, runnable, transcript, config, text_queue, send_interim
+        )
+        # AI 응답 전체를 한 프레임으로 (전사는 STT 직후 final_transcript로 이미 전송). 고정 문구 등
+        # 스트리밍 안 된 응답은 오디오보다 먼저, 스트리밍된 응답은 앞 문장 오디오가 이미 전송됐을 수 있음
+        await send_json_frame(websocket, {"type": "turn", "ai_text": ai_text})
+        if not streamed:
+            text_queue.put_nowait(ai_text)
+        text_queue.put_nowait(None)
+        await tts_task
+    finally:
+        tts_task.cancel()
+
+
+async def _compact_quietly(runnable, config: dict) -> None:
+    """compact_messages를 백그라운드로 실행. 요약 LLM 오류·타임아웃은 로그만 남기고 세션은 유지."""
+    try:
+        await compact_messages(runnable, config)
+    except Exception as e:
+        logger.warning("대화 요약 압축 실패 (%s): %s", config["configurable"]["thread_id"], e)
+
+
 async def _run_quiz_voice_loop(websocket: WebSocket):
-    """음성 청크 수신 → STT → 퀴즈 에이전트 → TTS 응답 (공통 로직)."""
+    """
+    음성 청크 수신 → STT → 퀴즈 에이전트 → TTS 응답 (공통 로직).
+    턴마다 프레임 순서:
+      1. STT 직후 {"type":"final_transcript","text"} (LLM 생성을 기다리지 않음)
+      2. 생성 중 {"type":"ai_delta"} (?interim=1로 구독한 클라이언트만)
+      3. 그래프 종료 후 {"type":"turn","ai_text"} (사용자 발화는 1번에서만 전송)
+    TTS 오디오는 문장마다 {"type":"audio_start"} → binary 프레임(스트리밍 청크, 이어 붙이면 WAV) → {"type":"audio_end"}로 전송.
+    chat 응답은 첫 문장 오디오가 3번보다 먼저 올 수 있고, 고정 문구 응답은 3번 뒤에 옴.
+    """
     session_id = websocket.query_params.get("session_id", str(uuid4()))
     config = {"configurable": {"thread_id": session_id}}
     runnable = get_app_runnable() 
-    audio_chunks = []
+    send_interim = websocket.query_params.get("interim") == "1"
+    pcm_buf = bytearray()  # 발화 단위 PCM 누적 (speech_end에서 한 번만 bytes로 복사)
+    compact_task: asyncio.Task | None = None  # 직전 턴의 요약 압축 (다음 발화 수신·STT와 병행)
 
     try:
         while True:
             message = await websocket.receive()
             if "bytes" in message:
-                audio_chunks.append(message["bytes"])
+                pcm_buf += message["bytes"]
             elif "text" in message:
-                data = json.loads(message["text"])
-                if data.get("type") == "speech_end" and audio_chunks:
-                    raw_pcm = b"".join(audio_chunks)
-                    audio_chunks = []
+                data = orjson.loads(message["text"])
+                if data.get("type") == "speech_end" and pcm_buf:
+                    raw_pcm = bytes(pcm_buf)
+                    pcm_buf.clear()
 
                     # 1. STT
                     transcript = await speech_to_text_gemini(raw_pcm)
-                    print(f"[STT] {transcript}")
-                    await websocket.send_json({"type": "final_transcript", "text": transcript})
-
-                    # 2. Agent Invoke
-                    result = await runnable.ainvoke({"messages": [("user", transcript)]}, config=config)
-                    ai_text = result["messages"][-1][1] if result["messages"] else "죄송해요."
-                    await websocket.send_json({"type": "ai_response_text", "text": ai_text})
-
-                    # 3. TTS
-                    audio_content = await text_to_speech_openai(ai_text)
-                    await websocket.send_json({
-                        "type": "audio",
-                        "data": base64.b64encode(audio_content).decode("utf-8"),
-                        "mime_type": "audio/wav"
-                    })
+                    logger.debug("[STT] %s", transcript)
+                    await send_json_frame(websocket, {"type": "final_transcript", "text": transcript})
+
+                    # 이전 턴의 압축이 체크포인트를 갱신한 뒤에 다음 턴 실행 (같은 thread 동시 쓰기 방지)
+                    if compact_task is not None:
+                        await compact_task
+
+                    # 2~3. Agent Invoke + TTS: chat 토큰 문장이 완성되는 대로 합성·전송 (구독 시 ai_delta도)
+                    await _run_agent_turn(websocket, runnable, transcript, config, send_interim)
+
+                    # 4. 긴 세션이면 오래된 메시지를 요약으로 압축 (다음 턴 LLM 입력 크기 제한, 수신 루프는 막지 않음)
+                    compact_task = asyncio.create_task(_compact_quietly(runnable, config))
     except WebSocketDisconnect:
-        print(f"Disconnected: {session_id}")
+        logger.debug("Disconnected: %s", session_id)
+    finally:
+        if compact_task is not None:
+            compact_task.cancel()
 
 
 @router.websocket("/quiz")
@@ -62,13 +256,39 @@ async def websocket_audio_endpoint(websocket: WebSocket):
     await _run_quiz_voice_loop(websocket)
 
 
+@lru_cache(maxsize=64)
 def _quiz_live_system_instruction(first_question: str, first_answer: str) -> str:
-    """첫 질문을 이미 TTS로 보냈을 때, Live API용 시스템 지시."""
+    """첫 질문을 이미 TTS로 보냈을 때, Live API용 시스템 지시. (질문이 같으면 동일 문자열 재사용)"""
     return f"""당신은 AiCupid 퀴즈 진행자입니다. 음성으로만 답하세요.
 첫 번째 질문 "{first_question}" (정답: {first_answer})는 이미 사용자에게 재생되었습니다.
 이제 사용자의 음성을 듣고, 정답 여부를 알려주고 다음 질문을 하거나 퀴즈를 마무리하세요. 친근하게, 한국어로 말하세요."""
 
 
+async def _get_first_question_audio(question: str) -> tuple[bytes, str]:
+    """첫 질문 TTS(WAV, base64)를 캐시에서 반환. 없으면 합성 후 저장 (진행 중인 합성이 있으면 그 결과를 기다림)."""
+    cached = _first_question_audio.get(question)
+    if cached is not None:
+        return cached
+    async with _first_question_lock:
+        cached = _first_question_audio.get(question)
+        if cached is None:
+            audio_wav = await text_to_speech_cached(question)
+            cached = (audio_wav, base64.b64encode(audio_wav).decode("ascii"))
+            _first_question_audio[question] = cached
+    return cached
+
+
+async def prewarm_first_question_audio() -> None:
+    """서버 기동 시 /ws/live 첫 질문 음성을 미리 합성. 실패해도 기동은 계속 (첫 연결 시 재시도)."""
+    from quiz_chain import quiz_data
+    if not quiz_data:
+        return
+    try:
+        await _get_first_question_audio(quiz_data[0]["question"])
+    except Exception as e:
+        logger.warning("첫 질문 TTS 사전 합성 실패: %s", e)
+
+
 @router.websocket("/live")
 async def websocket_live_endpoint(websocket: WebSocket):
     await websocket.accept()
@@ -78,9 +298,8 @@ async def websocket_live_endpoint(websocket: WebSocket):
             first_q = quiz_data[0]["question"]
             first_a = quiz_data[0]["answer"]
             # 첫 턴: 질문만 음성으로 전달 (STT 없이)
-            audio_wav = await text_to_speech_openai(first_q)
-            b64 = base64.b64encode(audio_wav).decode("utf-8")
-            await websocket.send_json({
+            _, b64 = await _get_first_question_audio(first_q)
+            await send_json_frame(websocket, {
                 "type": "first_question",
                 "text": first_q,
                 "audio": b64,
@@ -91,24 +310,28 @@ async def websocket_live_endpoint(websocket: WebSocket):
         else:
             await run_live_session(websocket)
     except Exception as e:
-        await websocket.send_json({"type": "error", "text": str(e)})
+        await send_json_frame(websocket, {"type": "error", "text": str(e)})
 
 
 def _parse_conversation_bytes_from_message(message: dict) -> bytes | None:
     """첫 메시지에서 대화 내역 바이트 추출. 바이트 프레임 또는 JSON(type: conversation_history) 지원."""
-    if "bytes" in message and message["bytes"]:
-        return bytes(message["bytes"])
-    if "text" in message and message["text"]:
-        try:
-            data = json.loads(message["text"])
-            if data.get("type") == "conversation_history":
-                payload = data.get("data") or data.get("payload") or data.get("base64")
-                if payload:
-                    return base64.b64decode(payload)
-                if "messages" in data:
-                    return json.dumps(data["messages"]).encode("utf-8")
-        except (json.JSONDecodeError, TypeError, ValueError):
-            pass
+    # 일반적인 경우: 바이너리 프레임 그대로 사용 (복사 없음)
+    b = message.get("bytes")
+    if b:
+        return b if isinstance(b, bytes) else bytes(b)
+    t = message.get("text")
+    if not t:
+        return None
+    try:
+        data = orjson.loads(t)
+        if data.get("type") == "conversation_history":
+            payload = data.get("data") or data.get("payload") or data.get("base64")
+            if payload:
+                return base64.b64decode(payload)
+            if "messages" in data:
+                return orjson.dumps(data["messages"])
+    except (orjson.JSONDecodeError, AttributeError, TypeError, ValueError):
+        pass
     return None
 
 
@@ -145,4 +368,4 @@ async def websocket_live_mc_endpoint(websocket: WebSocket):
             )
             await run_live_session(websocket, system_instruction=instruction, use_langchain_prompt=False)
     except Exception as e:
-        await websocket.send_json({"type": "error", "text": str(e)})
\ No newline at end of file
+        await send_json_frame(websocket, {"type": "error", "text": str(e)})
\ No newline at end of file
@@ -1,20 +1,32 @@
 # app/database.py
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+import os
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./cupid_main.py.db" # 기존 checkpoints.db와 분리 - 나중에 MySQL 등으로 변경 가능
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# 기존 checkpoints.db와 분리 - DATABASE_URL로 Postgres 등으로 변경 가능
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./cupid_main.py.db")
+
+
+def _to_async_url(url: str) -> str:
+    """동기 DSN을 async 드라이버 DSN으로 변환 (sqlite → aiosqlite, postgresql → asyncpg)."""
+    if url.startswith("postgresql://"):
+        return "postgresql+asyncpg://" + url[len("postgresql://"):]
+    if url.startswith("postgres://"):
+        return "postgresql+asyncpg://" + url[len("postgres://"):]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
+
+
+ASYNC_DATABASE_URL = _to_async_url(SQLALCHEMY_DATABASE_URL)
+
+engine = create_async_engine(ASYNC_DATABASE_URL)
+AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
 Base = declarative_base()
 
-# DB 세션 의존성 주입용
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
\ No newline at end of file
+
+# DB 세션 의존성 주입용 (AsyncSession)
+async def get_db():
+    async with AsyncSessionLocal() as session:
+        yield session
@@ -0,0 +1,86 @@
+"""
+공유 Gemini 채팅 모델.
+모듈마다 ChatGoogleGenerativeAI를 따로 만들지 않고, 하나의 클라이언트(커넥션 풀)를 재사용.
+"""
+
+import logging
+import os
+
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+logger = logging.getLogger(__name__)
+
+LLM_MODEL = "gemini-2.5-flash"
+LLM_TEMPERATURE = 0.7
+# 전송 계층 재시도(429·5xx·타임아웃)는 클라이언트에서만: 호출부는 응답 형식 오류만 재시도
+LLM_MAX_RETRIES = 3
+LLM_TIMEOUT = 30
+STT_MODEL = "models/gemini-1.5-flash"
+
+# 퀴즈 채점 응답 캐시: 같은 (질문, 정답, 답변)이면 Gemini 호출 없이 저장된 판정 사용
+# 전역(set_llm_cache)이 아니라 채점 모델에만 연결 — temperature가 있는 생성 호출은 매번 새 응답
+# REDIS_URL 있으면 Redis(워커 간 공유), 없으면 로컬 SQLite. LLM_CACHE=off로 끔
+LLM_CACHE_DB = os.getenv("LLM_CACHE_DB", ".langchain_cache.db")
+
+
+def _build_llm_cache():
+    """영속 LLM 캐시 생성 (LLM_CACHE=off면 None)."""
+    if os.getenv("LLM_CACHE", "on").lower() == "off":
+        return None
+    url = os.environ.get("REDIS_URL")
+    if url:
+        try:
+            import redis
+            from langchain_community.cache import RedisCache
+
+            return RedisCache(redis_=redis.Redis.from_url(url))
+        except ImportError:
+            logger.warning("REDIS_URL이 설정됐지만 redis 패키지가 없어 SQLite LLM 캐시를 사용합니다.")
+    from langchain_community.cache import SQLiteCache
+
+    return SQLiteCache(database_path=LLM_CACHE_DB)
+
+
+# LLM은 첫 사용 시 생성 (GEMINI_API_KEY 없어도 서버 기동 가능)
+_llm = None
+_stt_llm = None
+_grader_llm = None
+
+
+def get_llm() -> ChatGoogleGenerativeAI:
+    """LangGraph 노드·체인·API에서 공유하는 LLM 싱글톤. GEMINI_API_KEY만 사용."""
+    global _llm
+    if _llm is None:
+        api_key = os.environ.get("GEMINI_API_KEY")
+        _llm = ChatGoogleGenerativeAI(
+            model=LLM_MODEL,
+            temperature=LLM_TEMPERATURE,
+            api_key=api_key,
+            max_retries=LLM_MAX_RETRIES,
+            timeout=LLM_TIMEOUT,
+        )
+    return _llm
+
+
+def derive_llm(**overrides) -> ChatGoogleGenerativeAI:
+    """
+    공유 LLM에서 설정(temperature, model, cache 등)만 바꾼 사본.
+    model_copy라 내부 API 클라이언트는 그대로 공유됨 (호출 측에서 싱글톤으로 보관해 사용).
+    """
+    return get_llm().model_copy(update=overrides)
+
+
+def get_stt_llm() -> ChatGoogleGenerativeAI:
+    """음성 전사(STT)용 모델 싱글톤."""
+    global _stt_llm
+    if _stt_llm is None:
+        _stt_llm = derive_llm(model=STT_MODEL)
+    return _stt_llm
+
+
+def get_grader_llm() -> ChatGoogleGenerativeAI:
+    """퀴즈 채점용 모델 싱글톤 (temperature=0: 같은 입력이면 같은 판정 → 영속 캐시 사용)."""
+    global _grader_llm
+    if _grader_llm is None:
+        _grader_llm = derive_llm(temperature=0, cache=_build_llm_cache())
+    return _grader_llm
@@ -0,0 +1,41 @@
+"""
+로깅 설정.
+핸들러 I/O(stdout 쓰기)는 QueueListener 백그라운드 스레드에서 처리하고,
+요청 처리 경로에서는 QueueHandler로 큐에 넣기만 함 (stdout 락 경합 제거).
+"""
+
+import logging
+import logging.handlers
+import os
+import queue
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+_listener: logging.handlers.QueueListener | None = None
+
+
+def setup_logging() -> logging.handlers.QueueListener:
+    """루트 로거에 QueueHandler를 연결하고 StreamHandler를 가진 QueueListener 시작 (중복 호출 시 재사용)."""
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    root = logging.getLogger()
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """큐에 남은 로그를 모두 출력하고 리스너 스레드 종료."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
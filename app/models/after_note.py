@@ -1,5 +1,4 @@
-from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Index, func
 from app.database import Base
 
 class AfterNote(Base):
@@ -10,7 +9,17 @@ class AfterNote(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     sender_id = Column(String, index=True, nullable=False)   # 보내는 사람 (나)
-    receiver_id = Column(String, index=True, nullable=False) # 받는 사람 (상대방)
+    receiver_id = Column(String, nullable=False)             # 받는 사람 (상대방)
     choice = Column(Boolean, nullable=False)                 # 'O' 또는 'X'
     is_read = Column(Boolean, default=False)                # 읽음 여부 (알림용)
-    created_at = Column(DateTime, default=datetime.utcnow)
\ No newline at end of file
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+# 받은 쪽지 목록/안 읽은 알림 조회: receiver_id + is_read 필터, created_at 최신순
+# (receiver_id 단독 조회도 이 인덱스의 선두 컬럼으로 커버됨)
+Index(
+    "ix_after_receiver_unread_created",
+    AfterNote.receiver_id,
+    AfterNote.is_read,
+    AfterNote.created_at.desc(),
+)
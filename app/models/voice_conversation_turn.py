@@ -1,5 +1,4 @@
-from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index, func
 from app.database import Base
 
 
@@ -8,7 +7,15 @@ class VoiceConversationTurn(Base):
     __tablename__ = "voice_conversation_turns"
 
     id = Column(Integer, primary_key=True, index=True)
-    session_id = Column(String, index=True, nullable=False)
+    session_id = Column(String, nullable=False)
     user_text = Column(Text, nullable=True)   # 변환된 음성(전사)
     assistant_reply = Column(Text, nullable=False)  # 생성한 MC 답변
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+# 세션별 히스토리 조회 (session_id = ? ORDER BY created_at)
+Index(
+    "ix_vct_session_created",
+    VoiceConversationTurn.session_id,
+    VoiceConversationTurn.created_at,
+)
@@ -1,5 +1,4 @@
-from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, func
 from app.database import Base
 
 
@@ -11,4 +10,4 @@ class VoiceSession(Base):
     session_id = Column(String, index=True, nullable=False)
     user_id_1 = Column(String, nullable=False)
     user_id_2 = Column(String, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -1,6 +1,6 @@
 from enum import Enum
 from typing import List, Optional, Literal
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, TypeAdapter
 
 class InterestEnum(str, Enum):
     MOVIE = "영화"
@@ -101,9 +101,6 @@ class ProfileUpdateRequest(BaseModel):
     bio: Optional[str] = None
     profileImage: Optional[str] = None # Base64 string
 
-class MatchableUserListResponse(BaseModel):
-    users: List[UserProfile]
-
 class MatchableUserResponse(BaseModel):
     userId: str
     name: str
@@ -121,4 +118,7 @@ class CompatibilityResponse(BaseModel):
     mbti_compatibility: str
     interest_overlap: str
     success_probability: int
-    summary: str
\ No newline at end of file
+    summary: str
+
+# 목록 응답 직렬화용 어댑터 (임포트 시 1회 빌드 → 요청마다 스키마 재구성 없이 dump_json)
+MATCHABLE_USER_LIST_ADAPTER = TypeAdapter(MatchableUserListResponse)
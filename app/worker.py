@@ -0,0 +1,22 @@
+"""
+gunicorn용 Uvicorn 워커 (gunicorn.conf.py의 worker_class).
+음성 WebSocket 페이로드에 맞춘 uvicorn 설정을 워커에 전달.
+"""
+
+import os
+
+from uvicorn.workers import UvicornWorker
+
+# WAV 한 발화 + 여유분 (uvicorn 기본 16MB와 동일하게 두되 환경변수로 조정 가능)
+WS_MAX_SIZE = int(os.getenv("WS_MAX_SIZE", str(16 * 1024 * 1024)))
+
+
+class AudioUvicornWorker(UvicornWorker):
+    CONFIG_KWARGS = {
+        "loop": "auto",
+        "http": "auto",
+        "ws_max_size": WS_MAX_SIZE,
+        "ws_per_message_deflate": True,
+        # 워커당 동시 연결 상한 (초과 시 503). 미설정 시 제한 없음
+        "limit_concurrency": int(os.environ["WEB_LIMIT_CONCURRENCY"]) if os.getenv("WEB_LIMIT_CONCURRENCY") else None,
+    }
@@ -5,11 +5,17 @@ Gemini로 오디오를 전사(transcribe)합니다.
 
 from __future__ import annotations
 
-import os
 from typing import TypedDict
 
 from langgraph.graph import END, START, StateGraph
 
+try:
+    from google.genai import types
+except ImportError:  # google-genai 미설치 환경에서도 임포트 가능 (호출 시 오류)
+    types = None
+
+from live_bridge import get_genai_client
+
 
 class AudioToTextState(TypedDict):
     """오디오 → 텍스트 그래프 상태."""
@@ -22,11 +28,8 @@ class AudioToTextState(TypedDict):
 
 def _transcribe_node(state: AudioToTextState) -> dict:
     """Gemini로 오디오를 텍스트로 변환."""
-    from google import genai
-    from google.genai import types
-
-    api_key = os.environ.get("GEMINI_API_KEY")
-    if not api_key:
+    client = get_genai_client()
+    if client is None:
         return {"text": "", "error": "GEMINI_API_KEY not set"}
 
     audio_bytes = state.get("audio_bytes") or b""
@@ -35,7 +38,6 @@ def _transcribe_node(state: AudioToTextState) -> dict:
         return {"text": "", "error": "No audio data"}
 
     try:
-        client = genai.Client(api_key=api_key)
         prompt = "Transcribe this audio to text. Output only the transcribed text, in the same language as the speech. Do not add any explanation."
         try:
             part = types.Part.from_bytes(data=audio_bytes, mime_type=mime_type)
@@ -61,10 +63,10 @@ def build_audio_to_text_graph() -> StateGraph:
     return workflow
 
 
-def get_audio_to_text_runnable():
-    """컴파일된 그래프 반환 (캐시)."""
-    return build_audio_to_text_graph().compile()
-
-
 # LangGraph Studio(langgraph dev)에서 로드할 그래프 — langgraph.json에서 참조
 agent = build_audio_to_text_graph().compile()
+
+
+def get_audio_to_text_runnable():
+    """컴파일된 그래프 반환 (모듈 로드 시 한 번 컴파일한 agent 재사용)."""
+    return agent
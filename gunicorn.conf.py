@@ -0,0 +1,21 @@
+"""
+gunicorn 설정 (프로덕션). 실행: gunicorn main:app -c gunicorn.conf.py
+워커마다 이벤트 루프가 하나씩 있어 /ws/* 세션이 여러 프로세스로 분산됨.
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8080')}"
+
+# 워커 수: WEB_CONCURRENCY (기본 5). CPU 바운드가 아니라 LLM/TTS 대기 위주라 코어 수보다 조금 크게
+workers = int(os.getenv("WEB_CONCURRENCY", "5"))
+worker_class = "app.worker.AudioUvicornWorker"
+worker_connections = 1000
+backlog = 2048
+
+# 음성 세션이 길게 유지되므로 넉넉히 (워커 하트비트 기준)
+timeout = 120
+graceful_timeout = 30
+keepalive = 5
+
+loglevel = os.getenv("LOG_LEVEL", "info").lower()
@@ -10,24 +10,90 @@ Gemini Live API WebSocket 브리지.
 from __future__ import annotations
 
 import asyncio
+import atexit
 import base64
 import io
-import json
 import os
 import wave
 
+import orjson
+
+try:
+    from google import genai
+    from google.genai import types
+except ImportError:  # google-genai 미설치 환경에서도 임포트 가능 (호출 시 오류)
+    genai = None
+    types = None
+
 # GEMINI_API_KEY는 .env에서 로드된 상태여야 함
 
 
 # Live API 모델 (네이티브 오디오 지원)
 LIVE_MODEL = "gemini-2.5-flash-native-audio-preview-12-2025"
 
+# 입력 PCM 마이크로 배치: 100ms (16kHz mono int16 = 3200 bytes)가 모이거나
+# 첫 청크 이후 40ms가 지나면 한 번에 전송 → send_realtime_input 호출 수 감소
+LIVE_COALESCE_BYTES = 3200
+LIVE_BATCH_INTERVAL = 0.04
+# 입력 큐(청크 단위)가 가득 차면 수신 측에서 병합해 두는 PCM 상한: 5초 분량. 넘치면 오래된 음성부터 버림
+LIVE_INPUT_QUEUE_SIZE = 64
+LIVE_MAX_PENDING_BYTES = 16000 * 2 * 5
+# 출력 오디오(24kHz) 프레임 묶음: 4KB 이상 모였거나 첫 조각 후 40ms가 지나면 한 프레임으로 전송
+LIVE_OUT_COALESCE_BYTES = 4096
+
 # 기본 시스템 지시 (ai_agent.prompts.SYSTEM_PROMPT와 통일 가능)
 DEFAULT_SYSTEM_INSTRUCTION = """당신은 AiCupid 퀴즈·대화 에이전트입니다.
 사용자와 퀴즈를 진행하거나, 퀴즈와 무관한 대화를 할 수 있습니다.
 답변은 친근하고 짧게, 한국어로 해 주세요. 음성으로 자연스럽게 답해 주세요."""
 
 
+async def send_json_frame(websocket, data: dict) -> None:
+    """JSON 제어 프레임 전송 (orjson 직렬화, 텍스트 프레임 — 바이너리 프레임은 오디오 전용)."""
+    await websocket.send_text(orjson.dumps(data).decode())
+
+
+def encode_frame(data: dict) -> str:
+    """내용이 고정된 제어 프레임을 모듈 로드 시 한 번만 직렬화 (send_text로 그대로 전송)."""
+    return orjson.dumps(data).decode()
+
+
+_FRAME_INTERRUPTED = encode_frame({"type": "interrupted"})
+_FRAME_DONE = encode_frame({"type": "done"})
+_FRAME_CONNECTED = encode_frame({"type": "connected", "model": LIVE_MODEL})
+_FRAME_NO_API_KEY = encode_frame({"type": "error", "text": "GEMINI_API_KEY not set"})
+
+
+class _ClientDisconnected(Exception):
+    """프론트 WebSocket이 끊김 → 세션 TaskGroup 전체를 취소하기 위한 신호."""
+
+
+_genai_client = None
+
+
+def get_genai_client():
+    """google-genai Client 싱글톤 (HTTP 커넥션 풀 재사용). GEMINI_API_KEY가 없으면 None."""
+    global _genai_client
+    if _genai_client is None:
+        api_key = os.environ.get("GEMINI_API_KEY")
+        if not api_key or genai is None:
+            return None
+        _genai_client = genai.Client(api_key=api_key)
+        atexit.register(_close_genai_client)
+    return _genai_client
+
+
+def _close_genai_client():
+    """프로세스 종료 시 클라이언트 커넥션 정리."""
+    global _genai_client
+    client, _genai_client = _genai_client, None
+    close = getattr(client, "close", None)
+    if close is not None:
+        try:
+            close()
+        except Exception:
+            pass
+
+
 def ensure_pcm_16k(raw: bytes) -> bytes:
     """WAV면 헤더 제거해 PCM만 반환, 아니면 그대로 (Live API: 16bit PCM 16kHz)."""
     if len(raw) < 44 or raw[:4] != b"RIFF" or raw[8:12] != b"WAVE":
@@ -58,12 +124,9 @@ async def run_live_session(websocket, system_instruction: str | None = None, use
     - 프론트 → 백: binary(PCM) 또는 JSON {"audio": "base64..."}
     - 백 → 프론트: JSON {"type": "audio", "data": "base64"} / {"type": "text", "text": "..."} / {"type": "error"} / {"type": "done"}
     """
-    from google import genai
-    from google.genai import types
-
-    api_key = os.environ.get("GEMINI_API_KEY")
-    if not api_key:
-        await websocket.send_json({"type": "error", "text": "GEMINI_API_KEY not set"})
+    client = get_genai_client()
+    if client is None:
+        await websocket.send_text(_FRAME_NO_API_KEY)
         return
 
     if system_instruction is None and use_langchain_prompt:
@@ -75,99 +138,154 @@ async def run_live_session(websocket, system_instruction: str | None = None, use
         "system_instruction": instruction,
     }
 
-    client = genai.Client(api_key=api_key)
-    audio_queue_to_live = asyncio.Queue(maxsize=64)
+    audio_queue_to_live = asyncio.Queue(maxsize=LIVE_INPUT_QUEUE_SIZE)
 
     async def send_audio_to_live(session):
-        """WebSocket에서 받은 오디오를 Live API로 전달."""
-        try:
-            while True:
-                chunk = await audio_queue_to_live.get()
-                if chunk is None:
-                    break
+        """WebSocket에서 받은 오디오를 마이크로 배치로 묶어 Live API로 전달."""
+        loop = asyncio.get_running_loop()
+        buf = bytearray()
+        deadline = 0.0
+
+        async def flush():
+            if buf:
                 await session.send_realtime_input(
-                    audio=types.Blob(data=chunk, mime_type="audio/pcm;rate=16000")
+                    audio=types.Blob(data=bytes(buf), mime_type="audio/pcm;rate=16000")
                 )
-        except asyncio.CancelledError:
-            pass
-        except Exception as e:
-            await websocket.send_json({"type": "error", "text": str(e)})
+                buf.clear()
+
+        while True:
+            # 버퍼가 비어 있으면 타이머 없이 대기, 차 있으면 deadline까지만 대기
+            timeout = max(0.0, deadline - loop.time()) if buf else None
+            try:
+                chunk = await asyncio.wait_for(audio_queue_to_live.get(), timeout)
+            except asyncio.TimeoutError:
+                await flush()
+                continue
+            if not buf:
+                deadline = loop.time() + LIVE_BATCH_INTERVAL
+            buf.extend(chunk)
+            if len(buf) >= LIVE_COALESCE_BYTES:
+                await flush()
 
     async def receive_from_live(session):
-        """Live API 응답을 WebSocket으로 전달 (오디오 base64, 텍스트)."""
-        try:
-            async for message in session.receive():
-                if not message:
-                    continue
-                sc = getattr(message, "server_content", None)
-                if not sc:
-                    continue
-                if getattr(sc, "interrupted", False):
-                    await websocket.send_json({"type": "interrupted"})
-                    continue
-                mt = getattr(sc, "model_turn", None)
-                if not mt:
-                    continue
-                parts = getattr(mt, "parts", None) or []
-                for part in parts:
-                    inline = getattr(part, "inline_data", None)
-                    if inline and getattr(inline, "data", None):
-                        data = inline.data
-                        if isinstance(data, bytes):
-                            b64 = base64.b64encode(data).decode("ascii")
-                            await websocket.send_json({"type": "audio", "data": b64})
-                    if getattr(part, "text", None):
-                        await websocket.send_json({"type": "text", "text": part.text})
-            await websocket.send_json({"type": "done"})
-        except asyncio.CancelledError:
-            pass
-        except Exception as e:
-            await websocket.send_json({"type": "error", "text": str(e)})
+        """Live API 응답을 WebSocket으로 전달 (오디오 base64는 작은 조각을 묶어서, 텍스트)."""
+        loop = asyncio.get_running_loop()
+        out_buf = bytearray()
+        first_at = 0.0
 
-    async def read_from_websocket():
-        """WebSocket에서 오디오 청크 수신 → 큐에 넣음."""
+        async def flush_audio():
+            if out_buf:
+                b64 = base64.b64encode(out_buf).decode("ascii")
+                out_buf.clear()
+                await send_json_frame(websocket, {"type": "audio", "data": b64})
+
+        async def handle(message) -> None:
+            nonlocal first_at
+            sc = getattr(message, "server_content", None) if message else None
+            if not sc:
+                return
+            if getattr(sc, "interrupted", False):
+                out_buf.clear()  # 끊긴 응답의 남은 오디오는 버림
+                await websocket.send_text(_FRAME_INTERRUPTED)
+                return
+            mt = getattr(sc, "model_turn", None)
+            parts = (getattr(mt, "parts", None) or []) if mt else []
+            for part in parts:
+                inline = getattr(part, "inline_data", None)
+                if inline and getattr(inline, "data", None):
+                    data = inline.data
+                    if isinstance(data, bytes):
+                        if not out_buf:
+                            first_at = loop.time()
+                        out_buf.extend(data)
+                if getattr(part, "text", None):
+                    await flush_audio()  # 오디오/텍스트 순서 유지
+                    await send_json_frame(websocket, {"type": "text", "text": part.text})
+            if out_buf and (
+                len(out_buf) >= LIVE_OUT_COALESCE_BYTES
+                or loop.time() - first_at >= LIVE_BATCH_INTERVAL
+                or getattr(sc, "turn_complete", False)
+            ):
+                await flush_audio()
+
+        # 묶어 둔 오디오는 다음 메시지가 늦어도 첫 조각 후 LIVE_BATCH_INTERVAL이 지나면 전송.
+        # 다음 메시지 대기는 별도 태스크로 두고 타임아웃 시 취소하지 않음 (취소하면 receive 제너레이터가 닫힘)
+        messages = session.receive()
+        end = object()
+        pending = None
         try:
             while True:
-                raw = await websocket.receive()
-                if raw.get("type") == "websocket.disconnect":
+                if pending is None:
+                    pending = asyncio.create_task(anext(messages, end))
+                timeout = max(0.0, first_at + LIVE_BATCH_INTERVAL - loop.time()) if out_buf else None
+                done, _ = await asyncio.wait((pending,), timeout=timeout)
+                if not done:
+                    await flush_audio()
+                    continue
+                message, pending = pending.result(), None
+                if message is end:
                     break
-                if "bytes" in raw and raw["bytes"]:
-                    pcm = ensure_pcm_16k(bytes(raw["bytes"]))
-                    if pcm:
-                        await audio_queue_to_live.put(pcm)
-                elif "text" in raw:
-                    try:
-                        obj = json.loads(raw["text"])
-                        if "audio" in obj:
-                            chunk = base64.b64decode(obj["audio"])
-                            pcm = ensure_pcm_16k(chunk)
-                            if pcm:
-                                await audio_queue_to_live.put(pcm)
-                    except (json.JSONDecodeError, KeyError):
-                        pass
-            await audio_queue_to_live.put(None)
-        except asyncio.CancelledError:
-            pass
-        except Exception as e:
-            await audio_queue_to_live.put(None)
-            await websocket.send_json({"type": "error", "text": str(e)})
+                await handle(message)
+        finally:
+            if pending is not None:
+                pending.cancel()
+        await flush_audio()
+        await websocket.send_text(_FRAME_DONE)
+
+    async def read_from_websocket():
+        """
+        WebSocket에서 오디오 청크 수신 → 큐에 넣음 (배치는 send_audio_to_live에서). 연결이 끊기면 세션 전체 종료.
+        큐가 가득 차도 기다리지 않음: 자리가 날 때까지 pending에 병합해 두고 다음 청크와 함께 한 항목으로 넣음
+        (수신이 막히면 WebSocket 제어 메시지·끊김 감지도 함께 밀림).
+        """
+        pending = bytearray()
+
+        def enqueue(pcm: bytes) -> None:
+            pending.extend(pcm)
+            try:
+                audio_queue_to_live.put_nowait(bytes(pending))
+            except asyncio.QueueFull:
+                if len(pending) > LIVE_MAX_PENDING_BYTES:
+                    del pending[: len(pending) - LIVE_MAX_PENDING_BYTES]
+                return
+            pending.clear()
+
+        while True:
+            raw = await websocket.receive()
+            if raw.get("type") == "websocket.disconnect":
+                raise _ClientDisconnected
+            b = raw.get("bytes")
+            if b:
+                if not isinstance(b, (bytes, bytearray)):
+                    b = bytes(b)
+                pcm = ensure_pcm_16k(b)
+                if pcm:
+                    enqueue(pcm)
+            elif "text" in raw:
+                try:
+                    obj = orjson.loads(raw["text"])
+                    if "audio" in obj:
+                        chunk = base64.b64decode(obj["audio"])
+                        pcm = ensure_pcm_16k(chunk)
+                        if pcm:
+                            enqueue(pcm)
+                except (orjson.JSONDecodeError, KeyError):
+                    pass
 
     try:
         async with client.aio.live.connect(
             model=LIVE_MODEL,
             config=config,
         ) as session:
-            await websocket.send_json({"type": "connected", "model": LIVE_MODEL})
-
-            send_task = asyncio.create_task(send_audio_to_live(session))
-            recv_task = asyncio.create_task(receive_from_live(session))
-            ws_task = asyncio.create_task(read_from_websocket())
+            await websocket.send_text(_FRAME_CONNECTED)
 
-            await asyncio.gather(ws_task, recv_task)
-            send_task.cancel()
-            try:
-                await send_task
-            except asyncio.CancelledError:
-                pass
-    except Exception as e:
-        await websocket.send_json({"type": "error", "text": str(e)})
+            # 자식 태스크는 예외를 삼키지 않음 → 하나가 실패하거나 연결이 끊기면 TaskGroup이 나머지를 취소
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(send_audio_to_live(session))
+                tg.create_task(receive_from_live(session))
+                tg.create_task(read_from_websocket())
+    except* _ClientDisconnected:
+        pass  # 프론트가 나감: 보낼 곳이 없으므로 조용히 종료
+    except* Exception as eg:
+        # 먼저 실패한 자식의 예외만 전달 (나머지는 그 때문에 취소된 것)
+        await send_json_frame(websocket, {"type": "error", "text": str(eg.exceptions[0])})
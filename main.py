@@ -1,9 +1,15 @@
+import asyncio
+import hashlib
+import logging
 import os
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import APIRouter, FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from dotenv import load_dotenv
 
+from app.logging_config import setup_logging, shutdown_logging
+
 # API 라우터 임포트
 from app.database import engine, Base
 from app.models.voice_session import VoiceSession  # 테이블 생성 위해 import
@@ -12,80 +18,178 @@ from app.models.four_choice_question import FourChoiceQuestion
 from app.models.balance_game_question import BalanceGameQuestion
 from app.api.auth import router as auth_router
 from app.api.voice import router as voice_router
-from app.api.ws import router as ws_router
+from app.api.ws import router as ws_router, prewarm_first_question_audio, quiz_tts_sentences
 from app.api.agent import router as agent_router # 기존 파일 유지 시
 from app.api.users import router as users_router
 from app.api.after_note import router as after_router # 임포트 추가
 from app.models.after_note import AfterNote
+from services.agent import get_app_runnable
+from services.checkpointer import close_checkpointer, setup_checkpointer
+from services.voice import close_openai_client, prewarm_tts_cache
+from services.youtube_service import close_youtube_client
 
 load_dotenv()
+setup_logging()
+
+logger = logging.getLogger(__name__)
+
 
-# 서버 기동 시 설정된 환경변수 로그
+# 서버 기동 시 설정된 환경변수 로그 (LOG_LEVEL=DEBUG일 때만 포맷·출력)
 def _log_env():
-    env_keys = sorted(os.environ.keys())
-    print("\n=== Environment variables (server) ===")
-    for k in env_keys:
-        v = os.environ.get(k)
-        print(f"  {k}={v}")
-    print("=======================================\n")
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    lines = "\n".join(f"  {k}={os.environ.get(k)}" for k in sorted(os.environ.keys()))
+    logger.debug("=== Environment variables (server) ===\n%s", lines)
 
 
 _log_env()
 
-Base.metadata.create_all(bind=engine)
 
-app = FastAPI(
-    title="AiCupid Backend API",
-    description="""
-API 문서입니다.
+def _should_create_all() -> bool:
+    """스키마는 Alembic(alembic upgrade head)으로 관리. 로컬 개발 편의용으로 AUTO_CREATE_DB=1일 때만 create_all."""
+    return os.environ.get("AUTO_CREATE_DB") == "1"
 
-**WebSocket 연결 테스트:** [소켓 테스트 페이지](/docs/websocket-test)  
-→ `/ws/quiz-text`, `/ws/live`, `/ws/audio` 연결·텍스트 전송·수신 로그 확인
-""",
-)
-
-# CORS (allow_credentials=True 일 때는 allow_origins에 "*" 불가 → 구체적 origin 사용)
-_frontend_origin = os.environ.get("FRONTEND_ORIGIN", "http://localhost:3000").strip()
-_cors_origins = [
-    _frontend_origin,
-    "https://aicupid-frontend.vercel.app",
-    "http://localhost:3000",
-    "http://127.0.0.1:3000",
-    "http://localhost:5173",   # Vite 기본
-    "http://127.0.0.1:5173",
-]
-# 중복 제거, 빈 문자열 제거
-_cors_origins = list(dict.fromkeys(o for o in _cors_origins if o))
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=_cors_origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-    expose_headers=["*"],
-)
-
-# 라우터 등록
-app.include_router(auth_router, prefix="/api/auth")
-app.include_router(voice_router, prefix="/api") # /api/voice/...
-app.include_router(agent_router)               # 이미 /agent prefix 있음
-app.include_router(ws_router)                  # /ws/quiz
-app.include_router(users_router)
-app.include_router(after_router)
-
-@app.get("/")
+
+# 퀴즈 고정 문구 TTS 캐시 사전 합성 등 백그라운드 작업 (GC 방지용 참조)
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _spawn_background(coro) -> None:
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def _prewarm_runnables() -> None:
+    """퀴즈 그래프 컴파일·LLM 클라이언트 생성·체크포인트 테이블 준비를 첫 요청 전에 수행."""
+    try:
+        # AsyncSqliteSaver는 이벤트 루프에 묶이므로 스레드가 아닌 루프 안에서 생성
+        # 체크포인터 준비는 그래프 컴파일(LLM 생성) 실패와 무관하게 먼저 수행
+        await setup_checkpointer()
+        get_app_runnable()
+    except Exception as e:  # GEMINI_API_KEY 미설정 등 — 서버는 계속 기동, 첫 요청에서 다시 시도
+        logger.warning("퀴즈 에이전트 사전 준비 실패: %s", e)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 개발용 테이블 자동 생성 (워커마다 실행되므로 배포에서는 끄고 마이그레이션 사용)
+    if _should_create_all():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    # 에이전트 그래프 / 퀴즈 고정 문구 TTS 캐시 사전 준비 (백그라운드, 기동을 막지 않음)
+    # /ws/live 첫 질문 음성도 백그라운드로 사전 합성 (완료 전 연결은 첫 연결 시 합성)
+    if "ws" in _enabled_routers():
+        _spawn_background(prewarm_first_question_audio())
+    _spawn_background(_prewarm_runnables())
+    _spawn_background(prewarm_tts_cache(sorted(quiz_tts_sentences())))
+
+    yield
+
+    for task in list(_background_tasks):
+        task.cancel()
+    # 취소된 태스크가 실제로 끝난 뒤에 체크포인터·클라이언트·엔진을 닫음
+    await asyncio.gather(*_background_tasks, return_exceptions=True)
+    await close_checkpointer()
+    await close_youtube_client()
+    await close_openai_client()
+    await engine.dispose()
+    shutdown_logging()
+
+
+# 선택적으로 켤 수 있는 라우터: 이름 → (router, prefix)
+_ROUTERS = {
+    "auth": (auth_router, "/api/auth"),
+    "voice": (voice_router, "/api"),  # /api/voice/...
+    "agent": (agent_router, ""),      # 이미 /agent prefix 있음
+    "ws": (ws_router, ""),            # /ws/quiz
+    "users": (users_router, ""),
+    "after": (after_router, ""),
+}
+
+_core_router = APIRouter()
+
+
+@_core_router.get("/")
 def read_root():
     return {"service": "AiCupid-backend", "docs": "/docs"}
 
-@app.get("/health")
+
+@_core_router.get("/health")
 def health():
     return {"status": "ok"}
 
 
-@app.get("/docs/websocket-test", response_class=HTMLResponse)
-def docs_websocket_test():
+# 소켓 테스트 페이지: 기동 시 한 번 읽어 메모리에서 제공 (ETag로 재다운로드 생략)
+with open(os.path.join(os.path.dirname(__file__), "static", "websocket-test.html"), encoding="utf-8") as _f:
+    _WS_TEST_HTML = _f.read()
+_WS_TEST_ETAG = f'"{hashlib.md5(_WS_TEST_HTML.encode("utf-8")).hexdigest()}"'
+
+
+@_core_router.get("/docs/websocket-test", response_class=HTMLResponse)
+def docs_websocket_test(request: Request):
     """WebSocket 엔드포인트 연결 테스트용 HTML 페이지 (docs에 링크됨)."""
-    path = os.path.join(os.path.dirname(__file__), "static", "websocket-test.html")
-    with open(path, encoding="utf-8") as f:
-        return f.read()
\ No newline at end of file
+    headers = {"ETag": _WS_TEST_ETAG}
+    if request.headers.get("if-none-match") == _WS_TEST_ETAG:
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(_WS_TEST_HTML, headers=headers)
+
+
+def _enabled_routers() -> list[str]:
+    """ENABLED_ROUTERS=auth,ws,... 로 등록할 라우터 선택. 미설정 시 전체 등록."""
+    raw = os.getenv("ENABLED_ROUTERS", "").strip()
+    if not raw:
+        return list(_ROUTERS)
+    names = [n.strip() for n in raw.split(",") if n.strip()]
+    unknown = [n for n in names if n not in _ROUTERS]
+    if unknown:
+        raise ValueError(f"ENABLED_ROUTERS에 알 수 없는 라우터: {unknown} (가능: {list(_ROUTERS)})")
+    return names
+
+
+def create_app() -> FastAPI:
+    """FastAPI 앱 생성 (미들웨어·라우터 등록은 여기서 한 번만)."""
+    app = FastAPI(
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse,  # REST JSON 응답도 orjson 직렬화 (WebSocket 프레임과 동일)
+        title="AiCupid Backend API",
+        description="""
+API 문서입니다.
+
+**WebSocket 연결 테스트:** [소켓 테스트 페이지](/docs/websocket-test)  
+→ `/ws/quiz-text`, `/ws/live`, `/ws/audio` 연결·텍스트 전송·수신 로그 확인
+""",
+    )
+
+    # CORS (allow_credentials=True 일 때는 allow_origins에 "*" 불가 → 구체적 origin 사용)
+    frontend_origin = os.environ.get("FRONTEND_ORIGIN", "http://localhost:3000").strip()
+    cors_origins = [
+        frontend_origin,
+        "https://aicupid-frontend.vercel.app",
+        "http://localhost:3000",
+        "http://127.0.0.1:3000",
+        "http://localhost:5173",   # Vite 기본
+        "http://127.0.0.1:5173",
+    ]
+    # 중복 제거, 빈 문자열 제거
+    cors_origins = list(dict.fromkeys(o for o in cors_origins if o))
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=cors_origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["*"],
+    )
+
+    # 라우터 등록
+    app.include_router(_core_router)
+    for name in _enabled_routers():
+        router, prefix = _ROUTERS[name]
+        app.include_router(router, prefix=prefix)
+    return app
+
+
+app = create_app()
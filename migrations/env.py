@@ -0,0 +1,51 @@
+"""
+Alembic 마이그레이션 환경.
+앱과 같은 DATABASE_URL(async 드라이버)을 사용하고, 모델 메타데이터로 autogenerate 지원.
+"""
+
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+
+from app.database import ASYNC_DATABASE_URL, Base, engine
+# autogenerate가 모든 테이블을 보도록 모델 모듈 import
+from app.models import after_note, balance_game_question, four_choice_question, user, voice_conversation_turn, voice_session  # noqa: F401
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+render_as_batch = engine.dialect.name == "sqlite"  # SQLite ALTER 제약 → batch 모드
+
+
+def run_migrations_offline() -> None:
+    """DB 연결 없이 SQL 스크립트만 출력 (alembic upgrade head --sql)."""
+    context.configure(
+        url=ASYNC_DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        render_as_batch=render_as_batch,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def _do_run_migrations(connection) -> None:
+    context.configure(connection=connection, target_metadata=target_metadata, render_as_batch=render_as_batch)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_migrations_online() -> None:
+    """앱의 AsyncEngine으로 연결해 마이그레이션 실행."""
+    async with engine.connect() as connection:
+        await connection.run_sync(_do_run_migrations)
+    await engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_migrations_online())
@@ -0,0 +1,124 @@
+"""initial schema (Alembic 도입 이전 create_all로 만들어지던 스키마)
+
+question 테이블은 surrogate id PK, created_at은 server_default 없는 DATETIME.
+이후 스키마 변경은 0002에서 적용.
+기존에 create_all로 만든 DB(alembic_version 없음)는 이미 있는 테이블을 건너뛰므로
+stamp 없이 `alembic upgrade head`만 실행하면 됨.
+
+Revision ID: 0001_initial
+Revises:
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001_initial"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "users" not in existing:
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("userId", sa.String(), nullable=False),
+            sa.Column("email", sa.String(), nullable=True),
+            sa.Column("hashed_password", sa.String(), nullable=False),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("phone_number", sa.String(), nullable=True),
+            sa.Column("profile_image_url", sa.String(), nullable=True),
+            sa.Column("gender", sa.String(), nullable=False),
+            sa.Column("age", sa.Integer(), nullable=False),
+            sa.Column("interests", sa.JSON(), nullable=False),
+            sa.Column("mbti", sa.String(), nullable=True),
+            sa.Column("bio", sa.String(), nullable=True),
+        )
+        op.create_index("ix_users_id", "users", ["id"])
+        op.create_index("ix_users_userId", "users", ["userId"], unique=True)
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    if "voice_sessions" not in existing:
+        op.create_table(
+            "voice_sessions",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("session_id", sa.String(), nullable=False),
+            sa.Column("user_id_1", sa.String(), nullable=False),
+            sa.Column("user_id_2", sa.String(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_voice_sessions_id", "voice_sessions", ["id"])
+        op.create_index("ix_voice_sessions_session_id", "voice_sessions", ["session_id"])
+
+    if "voice_conversation_turns" not in existing:
+        op.create_table(
+            "voice_conversation_turns",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("session_id", sa.String(), nullable=False),
+            sa.Column("user_text", sa.Text(), nullable=True),
+            sa.Column("assistant_reply", sa.Text(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_voice_conversation_turns_id", "voice_conversation_turns", ["id"])
+        op.create_index("ix_voice_conversation_turns_session_id", "voice_conversation_turns", ["session_id"])
+
+    if "four_choice_questions" not in existing:
+        op.create_table(
+            "four_choice_questions",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("question_id", sa.String(), nullable=False),
+            sa.Column("session_id", sa.String(), nullable=False),
+            sa.Column("question_text", sa.Text(), nullable=False),
+            sa.Column("correct_answer", sa.Text(), nullable=False),
+            sa.Column("wrong_answer_1", sa.Text(), nullable=False),
+            sa.Column("wrong_answer_2", sa.Text(), nullable=False),
+            sa.Column("wrong_answer_3", sa.Text(), nullable=False),
+            sa.Column("about_user_name", sa.String(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_four_choice_questions_id", "four_choice_questions", ["id"])
+        op.create_index("ix_four_choice_questions_question_id", "four_choice_questions", ["question_id"], unique=True)
+        op.create_index("ix_four_choice_questions_session_id", "four_choice_questions", ["session_id"])
+
+    if "balance_game_questions" not in existing:
+        op.create_table(
+            "balance_game_questions",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("question_id", sa.String(), nullable=False),
+            sa.Column("session_id", sa.String(), nullable=False),
+            sa.Column("question_text", sa.Text(), nullable=False),
+            sa.Column("option_a", sa.Text(), nullable=False),
+            sa.Column("option_b", sa.Text(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_balance_game_questions_id", "balance_game_questions", ["id"])
+        op.create_index("ix_balance_game_questions_question_id", "balance_game_questions", ["question_id"], unique=True)
+        op.create_index("ix_balance_game_questions_session_id", "balance_game_questions", ["session_id"])
+
+    if "after_notes" not in existing:
+        op.create_table(
+            "after_notes",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("sender_id", sa.String(), nullable=False),
+            sa.Column("receiver_id", sa.String(), nullable=False),
+            sa.Column("choice", sa.Boolean(), nullable=False),
+            sa.Column("is_read", sa.Boolean(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_after_notes_id", "after_notes", ["id"])
+        op.create_index("ix_after_notes_sender_id", "after_notes", ["sender_id"])
+        op.create_index("ix_after_notes_receiver_id", "after_notes", ["receiver_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("after_notes")
+    op.drop_table("balance_game_questions")
+    op.drop_table("four_choice_questions")
+    op.drop_table("voice_conversation_turns")
+    op.drop_table("voice_sessions")
+    op.drop_table("users")
@@ -0,0 +1,131 @@
+"""question_id PK, DB에서 생성하는 created_at, 조회용 복합 인덱스
+
+- four_choice_questions / balance_game_questions: surrogate id 제거, question_id를 PK로 (테이블 재생성)
+- 모든 created_at: DateTime(timezone=True), server_default=now(), NOT NULL
+- voice_conversation_turns(session_id, created_at), after_notes(receiver_id, is_read, created_at DESC) 인덱스
+
+이미 반영된 부분(scripts/migrate_question_id_primary_key.py 실행, AUTO_CREATE_DB=1로 만든 DB 등)은 건너뜀.
+
+Revision ID: 0002_question_pk_server_timestamps
+Revises: 0001_initial
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002_question_pk_server_timestamps"
+down_revision = "0001_initial"
+branch_labels = None
+depends_on = None
+
+
+def _created_at() -> sa.Column:
+    return sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False)
+
+
+_QUESTION_COLUMNS = {
+    "four_choice_questions": lambda: [
+        sa.Column("session_id", sa.String(), nullable=False),
+        sa.Column("question_text", sa.Text(), nullable=False),
+        sa.Column("correct_answer", sa.Text(), nullable=False),
+        sa.Column("wrong_answer_1", sa.Text(), nullable=False),
+        sa.Column("wrong_answer_2", sa.Text(), nullable=False),
+        sa.Column("wrong_answer_3", sa.Text(), nullable=False),
+        sa.Column("about_user_name", sa.String(), nullable=True),
+    ],
+    "balance_game_questions": lambda: [
+        sa.Column("session_id", sa.String(), nullable=False),
+        sa.Column("question_text", sa.Text(), nullable=False),
+        sa.Column("option_a", sa.Text(), nullable=False),
+        sa.Column("option_b", sa.Text(), nullable=False),
+    ],
+}
+_TIMESTAMP_TABLES = ("voice_sessions", "voice_conversation_turns", "after_notes")
+
+
+def _rebuild_question_table(table: str, with_id: bool) -> None:
+    """PK 변경은 ALTER로 안 되는 DB(SQLite)가 있어 새 테이블에 복사 후 교체."""
+    tmp = f"{table}_new"
+    body = _QUESTION_COLUMNS[table]()
+    if with_id:
+        head = [sa.Column("id", sa.Integer(), primary_key=True), sa.Column("question_id", sa.String(), nullable=False)]
+        tail = [sa.Column("created_at", sa.DateTime(), nullable=True)]
+    else:
+        head = [sa.Column("question_id", sa.String(), primary_key=True)]
+        tail = [_created_at()]
+    op.create_table(tmp, *head, *body, *tail)
+
+    names = ", ".join(["question_id", *(c.name for c in body)])
+    op.execute(
+        f"INSERT INTO {tmp} ({names}, created_at) "
+        f"SELECT {names}, COALESCE(created_at, CURRENT_TIMESTAMP) FROM {table}"
+    )
+    op.drop_table(table)
+    op.rename_table(tmp, table)
+
+    if with_id:
+        op.create_index(f"ix_{table}_id", table, ["id"])
+        op.create_index(f"ix_{table}_question_id", table, ["question_id"], unique=True)
+    op.create_index(f"ix_{table}_session_id", table, ["session_id"])
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    timestamp_tables = list(_TIMESTAMP_TABLES)
+    for table in _QUESTION_COLUMNS:
+        if "id" in {c["name"] for c in inspector.get_columns(table)}:
+            _rebuild_question_table(table, with_id=False)
+        else:  # 스크립트로 PK만 바꾼 DB: created_at은 아직 예전 정의
+            timestamp_tables.append(table)
+
+    for table in timestamp_tables:
+        op.execute(f"UPDATE {table} SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL")
+        with op.batch_alter_table(table) as batch:
+            batch.alter_column(
+                "created_at",
+                existing_type=sa.DateTime(),
+                type_=sa.DateTime(timezone=True),
+                server_default=sa.func.now(),
+                nullable=False,
+            )
+
+    # batch 모드(SQLite)는 테이블을 다시 만들므로 인덱스는 변경 후 다시 조회
+    inspector = sa.inspect(op.get_bind())
+    vct_indexes = {i["name"] for i in inspector.get_indexes("voice_conversation_turns")}
+    if "ix_voice_conversation_turns_session_id" in vct_indexes:
+        op.drop_index("ix_voice_conversation_turns_session_id", table_name="voice_conversation_turns")
+    if "ix_vct_session_created" not in vct_indexes:
+        op.create_index("ix_vct_session_created", "voice_conversation_turns", ["session_id", "created_at"])
+
+    note_indexes = {i["name"] for i in inspector.get_indexes("after_notes")}
+    if "ix_after_notes_receiver_id" in note_indexes:
+        op.drop_index("ix_after_notes_receiver_id", table_name="after_notes")
+    if "ix_after_receiver_unread_created" not in note_indexes:
+        op.create_index(
+            "ix_after_receiver_unread_created",
+            "after_notes",
+            ["receiver_id", "is_read", sa.text("created_at DESC")],
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_after_receiver_unread_created", table_name="after_notes")
+    op.create_index("ix_after_notes_receiver_id", "after_notes", ["receiver_id"])
+    op.drop_index("ix_vct_session_created", table_name="voice_conversation_turns")
+    op.create_index("ix_voice_conversation_turns_session_id", "voice_conversation_turns", ["session_id"])
+
+    for table in _TIMESTAMP_TABLES:
+        with op.batch_alter_table(table) as batch:
+            batch.alter_column(
+                "created_at",
+                existing_type=sa.DateTime(timezone=True),
+                type_=sa.DateTime(),
+                server_default=None,
+                nullable=True,
+            )
+
+    for table in _QUESTION_COLUMNS:
+        _rebuild_question_table(table, with_id=True)
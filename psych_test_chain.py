@@ -1,12 +1,76 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.exceptions import OutputParserException
 from langchain_core.output_parsers.json import JsonOutputParser
 from pydantic import BaseModel, Field
 import json
 from typing import List, Dict
 
-# LLM 모델 초기화
-llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash", temperature=0.7)
+from app.llm import get_llm
+
+# 질문 생성 시도 횟수 (LLM이 잘못된 형식을 반환하면 순차 재시도)
+QUESTION_ATTEMPTS = 3
+# LLM이 잘못된 JSON을 반환했을 때의 예외
+_PARSE_ERRORS = (json.JSONDecodeError, TypeError, OutputParserException)
+
+DEFAULT_QUESTIONS = [
+    "함께 떠나는 여행, 비행기가 갑자기 낯선 무인도에 불시착했습니다. 가장 먼저 할 행동은 무엇인가요?",
+    "무인도에서 신비한 과일을 발견했습니다. 어떤 모양과 색깔의 과일인가요?",
+    "탐험 중 동굴을 발견했고, 그 안에서 잠들어있는 동물을 만났습니다. 어떤 동물이었나요?",
+]
+
+# 프롬프트는 모듈 로드 시 한 번만 파싱, 체인은 첫 사용 시 한 번만 구성
+QUESTIONS_PROMPT = ChatPromptTemplate.from_messages(
+    [
+        (
+            "system",
+            """당신은 연인 관계나 두 사람의 케미를 알아볼 수 있는 창의적인 심리테스트 출제자입니다.
+            서로에 대해 더 깊이 이해할 수 있는 흥미로운 질문 3개를 순서대로 제시해야 합니다.
+            질문들은 반드시 JSON 형식의 배열(array)로만 응답해주세요.
+
+            예시:
+            [
+                "함께 떠나는 여행, 비행기가 갑자기 낯선 무인도에 불시착했습니다. 가장 먼저 할 행동은 무엇인가요?",
+                "무인도에서 신비한 과일을 발견했습니다. 어떤 모양과 색깔의 과일인가요?",
+                "탐험 중 동굴을 발견했고, 그 안에서 잠들어있는 동물을 만났습니다. 어떤 동물이었나요?"
+            ]
+            """,
+        ),
+        ("user", "이전 대화 내용: {history}\n\n위 대화를 바탕으로, 두 사람을 위한 심리테스트 질문 3개를 JSON 배열 형태로 만들어줘."),
+    ]
+)
+
+ANALYSIS_PROMPT = ChatPromptTemplate.from_messages(
+    [
+        (
+            "system",
+            """당신은 커플 관계 및 심리 분석 전문가입니다.
+            주어진 심리테스트 질문과 두 사람의 답변을 종합적으로 분석하여, 두 사람의 성향, 가치관, 관계의 특징, 그리고 서로를 위한 조언을 담은 흥미로운 결과지를 작성해주세요.
+            결과는 친근하고 다정한 말투로 작성해야 합니다.
+            """,
+        ),
+        ("user", "심리테스트 질문: {questions}\n\n두 사람의 답변: {answers}\n\n위 내용을 바탕으로 종합적인 심리테스트 결과지를 작성해줘."),
+    ]
+)
+
+_questions_chain = None
+_analysis_chain = None
+
+
+def _get_questions_chain():
+    """심리테스트 질문 생성 체인 (JSON 배열 출력) 싱글톤."""
+    global _questions_chain
+    if _questions_chain is None:
+        _questions_chain = QUESTIONS_PROMPT | get_llm() | JsonOutputParser()
+    return _questions_chain
+
+
+def _get_analysis_chain():
+    """심리테스트 결과 분석 체인 싱글톤."""
+    global _analysis_chain
+    if _analysis_chain is None:
+        _analysis_chain = ANALYSIS_PROMPT | get_llm()
+    return _analysis_chain
+
 
 class TestQuestionGenerator(BaseModel):
     """두 사람의 관계와 성향을 알아보기 위한 심리테스트 질문 3개를 생성합니다."""
@@ -14,42 +78,24 @@ class TestQuestionGenerator(BaseModel):
 
     def generate_questions(self) -> List[str]:
         """LLM을 사용하여 질문 리스트를 생성하고 반환합니다."""
-        prompt = ChatPromptTemplate.from_messages(
-            [
-                (
-                    "system",
-                    """당신은 연인 관계나 두 사람의 케미를 알아볼 수 있는 창의적인 심리테스트 출제자입니다.
-                    서로에 대해 더 깊이 이해할 수 있는 흥미로운 질문 3개를 순서대로 제시해야 합니다.
-                    질문들은 반드시 JSON 형식의 배열(array)로만 응답해주세요.
-                    
-                    예시:
-                    [
-                        "함께 떠나는 여행, 비행기가 갑자기 낯선 무인도에 불시착했습니다. 가장 먼저 할 행동은 무엇인가요?",
-                        "무인도에서 신비한 과일을 발견했습니다. 어떤 모양과 색깔의 과일인가요?",
-                        "탐험 중 동굴을 발견했고, 그 안에서 잠들어있는 동물을 만났습니다. 어떤 동물이었나요?"
-                    ]
-                    """,
-                ),
-                ("user", "이전 대화 내용: {history}\n\n위 대화를 바탕으로, 두 사람을 위한 심리테스트 질문 3개를 JSON 배열 형태로 만들어줘."),
-            ]
-        )
-        
-        chain = prompt | llm | JsonOutputParser()
+        chain = _get_questions_chain()
         
-        for _ in range(3): # LLM이 가끔 잘못된 형식을 반환할 경우를 대비한 재시도
+        for _ in range(QUESTION_ATTEMPTS): # LLM이 가끔 잘못된 형식을 반환할 경우를 대비한 재시도
             try:
                 response = chain.invoke({"history": self.history})
-                if isinstance(response, list) and len(response) == 3:
+                if _is_valid_questions(response):
                     return response
-            except (json.JSONDecodeError, TypeError):
+            except _PARSE_ERRORS:
                 continue
         
         # 재시도 실패 시 기본 질문 반환
-        return [
-            "함께 떠나는 여행, 비행기가 갑자기 낯선 무인도에 불시착했습니다. 가장 먼저 할 행동은 무엇인가요?",
-            "무인도에서 신비한 과일을 발견했습니다. 어떤 모양과 색깔의 과일인가요?",
-            "탐험 중 동굴을 발견했고, 그 안에서 잠들어있는 동물을 만났습니다. 어떤 동물이었나요?"
-        ]
+        return list(DEFAULT_QUESTIONS)
+
+
+def _is_valid_questions(response) -> bool:
+    """LLM 응답이 질문 3개짜리 배열인지 확인."""
+    return isinstance(response, list) and len(response) == 3
+
 
 class TestResultAnalyzer(BaseModel):
     """모든 질문과 두 사람의 답변을 종합하여 심리테스트 결과를 분석합니다."""
@@ -58,19 +104,6 @@ class TestResultAnalyzer(BaseModel):
 
     def analyze(self) -> str:
         """LLM을 사용하여 종합적인 관계 분석 결과를 생성합니다."""
-        prompt = ChatPromptTemplate.from_messages(
-            [
-                (
-                    "system",
-                    """당신은 커플 관계 및 심리 분석 전문가입니다.
-                    주어진 심리테스트 질문과 두 사람의 답변을 종합적으로 분석하여, 두 사람의 성향, 가치관, 관계의 특징, 그리고 서로를 위한 조언을 담은 흥미로운 결과지를 작성해주세요.
-                    결과는 친근하고 다정한 말투로 작성해야 합니다.
-                    """,
-                ),
-                ("user", "심리테스트 질문: {questions}\n\n두 사람의 답변: {answers}\n\n위 내용을 바탕으로 종합적인 심리테스트 결과지를 작성해줘."),
-            ]
-        )
-        
-        chain = prompt | llm
+        chain = _get_analysis_chain()
         response = chain.invoke({"questions": self.questions, "answers": self.answers})
         return response.content
\ No newline at end of file
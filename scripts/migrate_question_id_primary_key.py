@@ -0,0 +1,93 @@
+"""
+four_choice_questions, balance_game_questions 테이블의 surrogate id(Integer PK)를 제거하고
+question_id를 PK로 바꾸는 마이그레이션.
+SQLite는 PK 변경을 지원하지 않으므로 테이블을 새로 만들고 데이터를 옮깁니다.
+
+사용법 (프로젝트 루트에서):
+  python scripts/migrate_question_id_primary_key.py
+"""
+import sqlite3
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 기준 DB 경로 (database.py와 동일)
+ROOT = Path(__file__).resolve().parent.parent
+DB_PATH = ROOT / "cupid_main.py.db"
+
+MIGRATIONS = {
+    "four_choice_questions": """
+        CREATE TABLE four_choice_questions_new (
+            question_id VARCHAR NOT NULL PRIMARY KEY,
+            session_id VARCHAR NOT NULL,
+            question_text TEXT NOT NULL,
+            correct_answer TEXT NOT NULL,
+            wrong_answer_1 TEXT NOT NULL,
+            wrong_answer_2 TEXT NOT NULL,
+            wrong_answer_3 TEXT NOT NULL,
+            about_user_name VARCHAR,
+            created_at DATETIME
+        );
+        INSERT INTO four_choice_questions_new (
+            question_id, session_id, question_text, correct_answer,
+            wrong_answer_1, wrong_answer_2, wrong_answer_3, about_user_name, created_at
+        )
+        SELECT question_id, session_id, question_text, correct_answer,
+            wrong_answer_1, wrong_answer_2, wrong_answer_3, about_user_name, created_at
+        FROM four_choice_questions;
+        DROP TABLE four_choice_questions;
+        ALTER TABLE four_choice_questions_new RENAME TO four_choice_questions;
+        CREATE INDEX IF NOT EXISTS ix_four_choice_questions_session_id ON four_choice_questions (session_id);
+    """,
+    "balance_game_questions": """
+        CREATE TABLE balance_game_questions_new (
+            question_id VARCHAR NOT NULL PRIMARY KEY,
+            session_id VARCHAR NOT NULL,
+            question_text TEXT NOT NULL,
+            option_a TEXT NOT NULL,
+            option_b TEXT NOT NULL,
+            created_at DATETIME
+        );
+        INSERT INTO balance_game_questions_new (
+            question_id, session_id, question_text, option_a, option_b, created_at
+        )
+        SELECT question_id, session_id, question_text, option_a, option_b, created_at
+        FROM balance_game_questions;
+        DROP TABLE balance_game_questions;
+        ALTER TABLE balance_game_questions_new RENAME TO balance_game_questions;
+        CREATE INDEX IF NOT EXISTS ix_balance_game_questions_session_id ON balance_game_questions (session_id);
+    """,
+}
+
+
+def main():
+    if not DB_PATH.exists():
+        print(f"DB 파일이 없습니다: {DB_PATH}")
+        print("마이그레이션 불필요. 서버 실행 시 새 스키마로 테이블이 생성됩니다.")
+        return 0
+
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        for table, script in MIGRATIONS.items():
+            columns = [r[1] for r in conn.execute(f"PRAGMA table_info({table})").fetchall()]
+            if not columns:
+                print(f"{table} 테이블이 없습니다. 마이그레이션 불필요.")
+                continue
+            if "id" not in columns:
+                print(f"{table}: 이미 question_id가 PK입니다. 마이그레이션 불필요.")
+                continue
+
+            print(f"{table} 테이블 재생성 (id 제거, question_id → PK)...")
+            conn.executescript(script)
+        conn.commit()
+        print("마이그레이션 완료.")
+        return 0
+    except sqlite3.Error as e:
+        print(f"오류: {e}", file=sys.stderr)
+        conn.rollback()
+        return 1
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -22,20 +22,25 @@ def main():
 
     conn = sqlite3.connect(DB_PATH)
     try:
-        conn.execute("PRAGMA table_info(voice_sessions)")
-        row = conn.execute("PRAGMA table_info(voice_sessions)").fetchone()
-        if not row:
+        # 컬럼 정보는 한 번만 조회해 존재 여부·타입 확인에 재사용
+        rows = conn.execute("PRAGMA table_info(voice_sessions)").fetchall()
+        if not rows:
             print("voice_sessions 테이블이 없습니다. 마이그레이션 불필요.")
             return 0
 
         # user_id_1 컬럼 타입 확인 (2=INTEGER, 3=TEXT 등)
-        for r in conn.execute("PRAGMA table_info(voice_sessions)").fetchall():
+        for r in rows:
             if r[1] == "user_id_1" and "TEXT" in (r[2] or "").upper():
                 print("user_id_1, user_id_2가 이미 String입니다. 마이그레이션 불필요.")
                 return 0
 
         print("voice_sessions 테이블 재생성 (user_id_1, user_id_2 → String)...")
+        # WAL + synchronous=NORMAL: 단계마다 fsync하지 않고, 전체를 트랜잭션 하나로 묶어 순차 쓰기
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
         conn.executescript("""
+            BEGIN IMMEDIATE;
             CREATE TABLE voice_sessions_new (
                 id INTEGER NOT NULL PRIMARY KEY,
                 session_id VARCHAR NOT NULL,
@@ -49,8 +54,9 @@ def main():
             DROP TABLE voice_sessions;
             ALTER TABLE voice_sessions_new RENAME TO voice_sessions;
             CREATE INDEX IF NOT EXISTS ix_voice_sessions_session_id ON voice_sessions (session_id);
+            ANALYZE voice_sessions;
+            COMMIT;
         """)
-        conn.commit()
         print("마이그레이션 완료.")
         return 0
     except sqlite3.Error as e:
@@ -1,68 +1,165 @@
-import operator
-import sqlite3
-from typing import TypedDict, Annotated
+import re
+from typing import TypedDict, Annotated, Literal
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, RemoveMessage, SystemMessage
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.graph.message import add_messages
+from langgraph.types import Command
+
+from services.checkpointer import get_checkpointer
 
 # 지연 로딩을 위한 싱글톤 변수
 _app_runnable = None
+_chat_llm = None
+
+# 노드가 내보내는 고정 문구 (TTS 캐시 사전 합성에도 사용)
+ASK_QUESTION_TEMPLATE = "퀴즈 질문입니다: {question}"
+CORRECT_TEMPLATE = "정답입니다! 현재 점수: {score}"
+WRONG_TEMPLATE = "아쉽네요. 정답은 '{answer}'입니다."
+FALLBACK_REPLY = "죄송해요."
+FINISH_REPLY = "퀴즈가 끝났어요! 함께해 주셔서 고마워요."
+
+# 라우터 키워드: "퀴즈"와 "시작"이 모두 들어간 발화 (순서 무관)
+_ROUTER_RE = re.compile(r"퀴즈.*시작|시작.*퀴즈", re.S)
+_QUESTION_MARK = "질문"
+
+# 단순 의도(인사·감사·점수 문의)는 LLM 없이 고정 문구로 응답: (패턴, 응답 템플릿 — {score} 사용 가능)
+_INTENT_PATTERNS = (
+    (
+        re.compile(r"^\s*(안녕(하세요)?|하이|헬로|hi|hello)\s*[!~.?]*\s*$", re.I),
+        "안녕하세요! '퀴즈 시작'이라고 말하면 퀴즈를 시작할게요.",
+    ),
+    (
+        re.compile(r"^\s*(고마워(요)?|감사(합니다|해요)?|thanks?|thank you)\s*[!~.]*\s*$", re.I),
+        "천만에요! 언제든 또 불러 주세요.",
+    ),
+    (re.compile(r"점수\s*(몇|얼마|알려|좀)"), "현재 점수는 {score}점이에요."),
+)
+
+# 라우터 액션 → 다음 노드 (고정 라우트 테이블)
+_ROUTES = {"grade": "grade_answer", "ask": "ask_question", "chat": "chat", "canned": "canned", "finish": "finish"}
+_RouterGoto = Literal["grade_answer", "ask_question", "chat", "canned", "finish"]
+
+# 슬라이딩 윈도우: messages가 이보다 많아지면 오래된 절반을 요약(summary)으로 압축
+SUMMARY_TRIGGER = 20
+SUMMARY_PROMPT = "다음은 퀴즈/대화 기록입니다. 이후 대화에 필요한 핵심만 한국어로 3문장 이내로 요약하세요."
 
 class AgentState(TypedDict):
-    messages: Annotated[list, operator.add]
+    messages: Annotated[list[BaseMessage], add_messages]  # ("user", text) 입력도 HumanMessage로 변환됨
     question_id: int
     score: int
-    next_action: str
+    last_ai: str  # 마지막 AI 응답 텍스트 (핸들러에서 messages 역순 탐색 없이 바로 사용)
+    summary: str  # messages에서 제거된 오래된 대화의 요약 (chat 노드 프롬프트 앞에 붙음)
+    canned_response: str  # 라우터가 고른 고정 응답 (canned 노드가 그대로 반환)
+
+
+def _match_canned_intent(text: str, score: int) -> str | None:
+    """단순 의도 패턴에 맞으면 고정 응답, 아니면 None."""
+    for pattern, template in _INTENT_PATTERNS:
+        if pattern.search(text) is not None:
+            return template.format(score=score)
+    return None
+
+def _after_grade_reply(state: dict, msg: str) -> str:
+    """같은 턴에 채점 직후 실행된 노드면 채점 피드백을 앞에 붙인 응답 (TTS·turn 프레임은 last_ai 하나만 사용)."""
+    messages = state.get("messages") or []
+    if messages and isinstance(messages[-1], AIMessage):
+        return f"{messages[-1].content}\n{msg}"
+    return msg
+
+
+def quiz_tts_phrases() -> list[str]:
+    """퀴즈 흐름에서 항상 같은 문장으로 나오는 AI 응답 목록 (TTS 캐시 사전 합성용)."""
+    from quiz_chain import quiz_data
+
+    phrases = [FALLBACK_REPLY, FINISH_REPLY]
+    for item in quiz_data:
+        phrases.append(ASK_QUESTION_TEMPLATE.format(question=item["question"]))
+        phrases.append(WRONG_TEMPLATE.format(answer=item["answer"]))
+    phrases.extend(CORRECT_TEMPLATE.format(score=n) for n in range(1, len(quiz_data) + 1))
+    phrases.extend(template for _, template in _INTENT_PATTERNS if "{score}" not in template)
+    return phrases
+
+
+def _get_chat_llm():
+    """chat 노드·요약용 LLM 싱글톤 (캐시 없음: 대화 전체가 입력이라 거의 적중하지 않고 토큰 스트리밍을 막음)."""
+    global _chat_llm
+    if _chat_llm is None:
+        from app.llm import derive_llm
+
+        _chat_llm = derive_llm(temperature=0)
+    return _chat_llm
+
 
 def get_app_runnable():
     global _app_runnable
     if _app_runnable is not None:
         return _app_runnable
 
-    from langchain_google_genai import ChatGoogleGenerativeAI
     from quiz_chain import QuizGrader, QuestionProvider, quiz_data
 
-    llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash", temperature=0)
+    llm = _get_chat_llm()
+    quiz_len = len(quiz_data)
 
     # --- 기존 노드 로직 (동일) ---
-    def router_node(state: AgentState):
+    def router_node(state: AgentState) -> Command[_RouterGoto]:
         messages = state["messages"]
         last_message = messages[-1]
         action = "chat"
         
         # 퀴즈 시작 키워드 체크
-        if "퀴즈" in last_message[1] and "시작" in last_message[1]:
-            return {"next_action": "ask"}
+        if _ROUTER_RE.search(last_message.content) is not None:
+            return Command(goto=_ROUTES["ask"])
 
         # 메시지가 2개 이상일 때만 이전 AI 메시지 확인
         if len(messages) >= 2:
-            prev_role, prev_msg = messages[-2]
-            if state["question_id"] < len(quiz_data):
-                if prev_role == "ai" and "질문" in prev_msg:
+            prev = messages[-2]
+            if state.get("question_id", 0) < quiz_len:
+                if isinstance(prev, AIMessage) and _QUESTION_MARK in prev.content:
                     action = "grade"
                 else:
                     action = "ask"
             else:
                 action = "finish"
+
+        # 답변 채점 차례가 아니면 단순 의도부터 확인 (맞으면 chat LLM 호출 생략)
+        if action != "grade":
+            canned = _match_canned_intent(last_message.content, state.get("score", 0))
+            if canned is not None:
+                return Command(update={"canned_response": canned}, goto=_ROUTES["canned"])
         
-        return {"next_action": action}
+        return Command(goto=_ROUTES[action])
 
-    def grade_answer_node(state: AgentState):
-        user_answer = state["messages"][-1][1]
-        q_id = state["question_id"]
+    async def grade_answer_node(state: AgentState):
+        user_answer = state["messages"][-1].content
+        q_id = state.get("question_id", 0)
         grader = QuizGrader(user_answer=user_answer, question_id=q_id)
-        is_correct = grader.grade()
-        new_score = state["score"] + (1 if is_correct else 0)
-        msg = f"정답입니다! 현재 점수: {new_score}" if is_correct else f"아쉽네요. 정답은 '{quiz_data[q_id]['answer']}'입니다."
-        return {"messages": [("ai", msg)], "score": new_score, "question_id": q_id + 1}
+        is_correct = await grader.grade()
+        new_score = state.get("score", 0) + (1 if is_correct else 0)
+        msg = CORRECT_TEMPLATE.format(score=new_score) if is_correct else WRONG_TEMPLATE.format(answer=quiz_data[q_id]["answer"])
+        return {"messages": [AIMessage(content=msg)], "last_ai": msg, "score": new_score, "question_id": q_id + 1}
+
+    async def ask_question_node(state: AgentState):
+        q_id = state.get("question_id", 0)
+        question = await QuestionProvider(question_id=q_id).get_question()
+        msg = ASK_QUESTION_TEMPLATE.format(question=question)
+        return {"messages": [AIMessage(content=msg)], "last_ai": _after_grade_reply(state, msg)}
 
-    def ask_question_node(state: AgentState):
-        q_id = state["question_id"]
-        question = QuestionProvider(question_id=q_id).get_question()
-        return {"messages": [("ai", f"퀴즈 질문입니다: {question}")]}
+    def canned_node(state: AgentState):
+        msg = state.get("canned_response") or FALLBACK_REPLY
+        return {"messages": [AIMessage(content=msg)], "last_ai": msg}
 
-    def chat_node(state: AgentState):
-        response = llm.invoke(state["messages"])
-        return {"messages": [response]}
+    def finish_node(state: AgentState):
+        # 퀴즈 종료 후 발화: 고정 문구로 응답 (last_ai를 갱신하지 않으면 이전 응답이 다시 재생됨)
+        return {"messages": [AIMessage(content=FINISH_REPLY)], "last_ai": _after_grade_reply(state, FINISH_REPLY)}
+
+    async def chat_node(state: AgentState):
+        # 비동기 호출 → astream_events에서 토큰 단위 on_chat_model_stream 이벤트로 스트리밍 가능
+        summary = state.get("summary")
+        messages = state["messages"]
+        if summary:
+            messages = [SystemMessage(content=f"이전 대화 요약: {summary}"), *messages]
+        response = await llm.ainvoke(messages)
+        return {"messages": [response], "last_ai": response.content}
 
     # --- 그래프 빌드 ---
     workflow = StateGraph(AgentState)
@@ -70,17 +167,47 @@ def get_app_runnable():
     workflow.add_node("grade_answer", grade_answer_node)
     workflow.add_node("ask_question", ask_question_node)
     workflow.add_node("chat", chat_node)
+    workflow.add_node("canned", canned_node)
+    workflow.add_node("finish", finish_node)
     
     workflow.set_entry_point("router")
-    workflow.add_conditional_edges("router", lambda x: x["next_action"], 
-                                 {"grade": "grade_answer", "ask": "ask_question", "chat": "chat", "finish": END})
-    workflow.add_edge("grade_answer", "router")
-    workflow.add_edge("ask_question", "router")
-    workflow.add_edge("chat", "router")
+    def after_grade(state: AgentState) -> Literal["ask_question", "finish"]:
+        # 채점 후 같은 턴에 다음 질문(또는 종료 문구)까지 → 사용자의 다음 발화가 곧바로 채점됨
+        return "ask_question" if state.get("question_id", 0) < quiz_len else "finish"
+
+    # router는 Command(goto=...)로 분기. 채점 뒤에는 다음 질문/종료로 이어지고, 나머지 응답 노드는 실행 후 종료
+    workflow.add_conditional_edges("grade_answer", after_grade, ["ask_question", "finish"])
+    workflow.add_edge("ask_question", END)
+    workflow.add_edge("chat", END)
+    workflow.add_edge("canned", END)
+    workflow.add_edge("finish", END)
 
     # --- SQLite 체크포인터 설정 ---
-    # 파일 이름을 'checkpoints.db'로 설정하여 데이터를 로컬에 물리적으로 저장합니다.
-    memory = SqliteSaver.from_conn_string("checkpoints.db")
-    _app_runnable = workflow.compile(checkpointer=memory)
+    # thread_id(session_id)별 상태를 checkpoints.db(GRAPH_CP)에 저장 → 턴마다 새 메시지만 전달
+    _app_runnable = workflow.compile(checkpointer=get_checkpointer())
     
-    return _app_runnable
\ No newline at end of file
+    return _app_runnable
+
+
+async def compact_messages(runnable, config: dict) -> None:
+    """
+    턴 종료 후 호출. messages가 SUMMARY_TRIGGER를 넘으면 오래된 절반을 요약해 summary에 합치고
+    체크포인트에서 제거 → 턴마다 LLM에 넘기는 대화 길이를 일정하게 유지.
+    """
+    snapshot = await runnable.aget_state(config)
+    messages = snapshot.values.get("messages") or []
+    if len(messages) <= SUMMARY_TRIGGER:
+        return
+
+    old = messages[: len(messages) // 2]
+    prev_summary = snapshot.values.get("summary") or ""
+    lines = [f"- {'ai' if isinstance(m, AIMessage) else 'user'}: {m.content}" for m in old]
+    if prev_summary:
+        lines.insert(0, f"(기존 요약) {prev_summary}")
+    response = await _get_chat_llm().ainvoke(
+        [SystemMessage(content=SUMMARY_PROMPT), HumanMessage(content="\n".join(lines))]
+    )
+    await runnable.aupdate_state(
+        config,
+        {"summary": response.content, "messages": [RemoveMessage(id=m.id) for m in old]},
+    )
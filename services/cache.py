@@ -0,0 +1,48 @@
+"""
+프로세스 내 캐시 유틸리티.
+TTS 오디오 등 같은 입력이면 결과가 같은 값을 재사용할 때 사용.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def content_key(*parts) -> str:
+    """입력 값들로 sha256 캐시 키 생성 (텍스트 + 보이스 + 모델 등)."""
+    h = hashlib.sha256()
+    for p in parts:
+        h.update(str(p).encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+class LRUCache:
+    """크기 제한 LRU 캐시 (스레드 안전). 가장 오래 안 쓴 항목부터 제거."""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return default
+            return self._data[key]
+
+    def set(self, key, value) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
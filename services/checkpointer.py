@@ -0,0 +1,79 @@
+"""
+LangGraph 체크포인터 (세션 상태 영속화).
+thread_id(=session_id) 단위로 그래프 상태를 저장해, 다음 턴에는 새 메시지만 넘기면 됨.
+"""
+
+import asyncio
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows: 파일 락 없이 진행 (로컬 단일 프로세스 개발용)
+    fcntl = None
+
+import aiosqlite
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+# 체크포인트 DB 경로 (앱 DB와 분리)
+GRAPH_CHECKPOINT_DB = os.getenv("GRAPH_CP", "checkpoints.db")
+_SETUP_LOCK_PATH = GRAPH_CHECKPOINT_DB + ".setup.lock"
+
+# 연결 단위 PRAGMA: 턴마다 체크포인트 쓰기 fsync 감소(WAL + NORMAL), 페이지 캐시 약 20MB
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-20000",
+)
+
+_checkpointer = None
+
+
+class _TunedAsyncSqliteSaver(AsyncSqliteSaver):
+    """연결을 처음 여는 곳(setup)에서 PRAGMA까지 적용하는 AsyncSqliteSaver.
+    사전 준비(lifespan) 성공 여부와 관계없이, 첫 체크포인트 조회/저장이 연결을 열어도 같은 설정이 적용됨."""
+
+    async def setup(self) -> None:
+        async with self.lock:
+            if not self.is_setup and not self.conn.is_alive():
+                await self.conn
+                for pragma in _CONNECTION_PRAGMAS:
+                    await self.conn.execute(pragma)
+        await super().setup()  # 테이블 생성 (이미 준비됐으면 바로 반환)
+
+
+def get_checkpointer() -> AsyncSqliteSaver:
+    """
+    AsyncSqliteSaver 싱글톤 (여러 그래프가 같은 연결 공유).
+    aiosqlite 연결이 이벤트 루프에 묶이므로 루프 안(핸들러/lifespan)에서 처음 호출해야 함.
+    """
+    global _checkpointer
+    if _checkpointer is None:
+        conn = aiosqlite.connect(GRAPH_CHECKPOINT_DB, check_same_thread=False)
+        _checkpointer = _TunedAsyncSqliteSaver(conn)
+    return _checkpointer
+
+
+def _acquire_setup_lock():
+    """체크포인트 테이블 생성용 프로세스 간 배타 락 (gunicorn 워커 여러 개가 동시에 setup하지 않도록)."""
+    f = open(_SETUP_LOCK_PATH, "w")
+    if fcntl is not None:
+        fcntl.flock(f, fcntl.LOCK_EX)
+    return f
+
+
+async def setup_checkpointer() -> None:
+    """체크포인트 테이블 사전 준비. 파일 락으로 워커 간 직렬화 (락 대기는 스레드에서)."""
+    lock_file = await asyncio.to_thread(_acquire_setup_lock)
+    try:
+        await get_checkpointer().setup()  # 연결 열기(PRAGMA 포함) + 테이블 생성
+    finally:
+        lock_file.close()  # close 시 flock 해제
+
+
+async def close_checkpointer() -> None:
+    """앱 종료 시 체크포인트 DB 연결 정리."""
+    global _checkpointer
+    if _checkpointer is not None:
+        if _checkpointer.conn.is_alive():
+            await _checkpointer.conn.close()
+        _checkpointer = None
@@ -0,0 +1,57 @@
+"""
+헤지(hedged) 요청 유틸리티.
+느리거나 형식이 틀린 LLM 응답 한 번 때문에 요청 전체가 재시도 횟수만큼 늘어지지 않도록,
+응답이 늦으면 같은 호출을 하나 더 띄우고 먼저 도착한 유효한 결과를 사용.
+"""
+
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def first_valid(attempt, *, attempts: int = 3, delay: float = 2.0, is_valid=bool):
+    """
+    attempt()(코루틴 함수)를 최대 attempts번 실행해 is_valid를 통과한 첫 결과를 반환.
+    - 처음엔 하나만 실행, delay초 안에 유효한 결과가 없으면 다음 시도를 추가로 띄움 (동시에 여러 개 진행 가능)
+    - 시도가 실패(예외)하거나 무효한 결과를 내면 기다리지 않고 바로 다음 시도를 띄움
+    - 유효한 결과가 나오면 남은 시도는 취소
+    전부 실패하면 마지막 예외를 다시 발생, 예외 없이 전부 무효면 마지막 결과를 반환.
+    """
+    pending: set[asyncio.Task] = set()
+    started = 0
+    last_result = None
+    last_error: BaseException | None = None
+
+    def launch() -> None:
+        nonlocal started
+        started += 1
+        pending.add(asyncio.create_task(attempt()))
+
+    launch()
+    try:
+        while pending:
+            timeout = delay if started < attempts else None
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                logger.debug("헤지 시도 추가 (%d/%d)", started + 1, attempts)
+                launch()
+                continue
+            for task in done:
+                try:
+                    result = task.result()
+                except Exception as e:
+                    last_error = e
+                    continue
+                if is_valid(result):
+                    return result
+                last_result = result
+            if started < attempts:
+                launch()
+    finally:
+        for task in pending:
+            task.cancel()
+
+    if last_error is not None and last_result is None:
+        raise last_error
+    return last_result
@@ -1,20 +1,38 @@
 # services/s3_service.py
+import logging
 import boto3
 import os
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import NoCredentialsError
 
+logger = logging.getLogger(__name__)
+
 # .env 파일이나 환경 변수에서 설정값 가져오기
 AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
 AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
 AWS_REGION = os.getenv("AWS_REGION", "ap-northeast-1")
 S3_BUCKET_NAME = os.getenv("S3_BUCKET_NAME")
 
-# S3 클라이언트 생성
+# S3 클라이언트 생성 (커넥션 풀 확대 + keepalive, 표준 재시도 모드)
 s3_client = boto3.client(
     's3',
     aws_access_key_id=AWS_ACCESS_KEY_ID,
     aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-    region_name=AWS_REGION
+    region_name=AWS_REGION,
+    config=Config(
+        max_pool_connections=50,
+        tcp_keepalive=True,
+        retries={"max_attempts": 3, "mode": "standard"},
+    ),
+)
+
+# 8MB 이상이면 8MB 파트로 나눠 최대 8개 동시 업로드 (큰 오디오·이미지 첨부)
+_TRANSFER_CFG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=8,
+    use_threads=True,
 )
 
 def upload_file_to_s3(file, object_name=None):
@@ -32,7 +50,8 @@ def upload_file_to_s3(file, object_name=None):
             file.file,
             S3_BUCKET_NAME,
             object_name,
-            ExtraArgs={'ContentType': file.content_type} # 파일 타입에 맞게 ContentType 설정
+            ExtraArgs={'ContentType': file.content_type}, # 파일 타입에 맞게 ContentType 설정
+            Config=_TRANSFER_CFG,
         )
         
         # 업로드된 파일의 URL 생성
@@ -40,13 +59,13 @@ def upload_file_to_s3(file, object_name=None):
         return file_url
 
     except FileNotFoundError:
-        print("The file was not found")
+        logger.error("The file was not found")
         return None
     except NoCredentialsError:
-        print("Credentials not available")
+        logger.error("Credentials not available")
         return None
     except Exception as e:
-        print(f"An error occurred: {e}")
+        logger.exception("S3 upload error: %s", e)
         return None
 
 def upload_file_to_s3_raw(file_bytes, object_name, ext):
@@ -59,5 +78,5 @@ def upload_file_to_s3_raw(file_bytes, object_name, ext):
         )
         return f"https://{S3_BUCKET_NAME}.s3.{AWS_REGION}.amazonaws.com/{object_name}"
     except Exception as e:
-        print(f"S3 Raw Upload Error: {e}")
+        logger.exception("S3 Raw Upload Error: %s", e)
         return None
\ No newline at end of file
@@ -1,61 +1,196 @@
-import io
-import wave
+import os
+import struct
 import base64
-from langchain_google_genai import ChatGoogleGenerativeAI
-# from google.cloud import texttospeech  # 사용 시 google-cloud-texttospeech 설치
-# from gtts import gTTS  # 사용 시: pip install gtts
+import logging
+import httpx
 import openai
-import io
+
+from app.llm import get_stt_llm
+from services.cache import LRUCache, content_key
+
+logger = logging.getLogger(__name__)
+
+# 음성 서비스 공개 API (STT·TTS·캐시·WAV 변환)
+__all__ = [
+    "speech_to_text_gemini",
+    "text_to_speech_openai",
+    "text_to_speech_openai_stream",
+    "text_to_speech_cached",
+    "text_to_speech_stream_cached",
+    "prewarm_tts_cache",
+    "pcm_to_wav",
+    "close_openai_client",
+]
+
+# OpenAI TTS 설정 (캐시 키에도 포함)
+TTS_MODEL = "tts-1"
+TTS_VOICE = "alloy"
+TTS_FORMAT = "wav"
+TTS_STREAM_CHUNK = 8192  # 스트리밍 TTS 청크 크기 (bytes)
+TTS_CACHE_TTL = 24 * 60 * 60  # Redis TTL (초)
+
+# 고정 문구 TTS 캐시: 프로세스 내 LRU → (REDIS_URL 설정 시) Redis
+_tts_cache = LRUCache(maxsize=256)
+_redis = None  # None: 미초기화, False: Redis 사용 안 함
+_openai_client = None
 
 # ── 헬퍼: Raw PCM을 Gemini가 인식 가능한 WAV로 변환 ──
-def _pcm_to_wav(raw_pcm: bytes, sample_rate: int = 16000) -> bytes:
-    with io.BytesIO() as wav_io:
-        with wave.open(wav_io, 'wb') as wav_file:
-            wav_file.setnchannels(1)  # Mono
-            wav_file.setsampwidth(2)  # 16-bit
-            wav_file.setframerate(sample_rate)
-            wav_file.writeframes(raw_pcm)
-        return wav_io.getvalue()
+# 44바이트 RIFF 헤더: RIFF/WAVE + fmt 청크(PCM, mono, 16-bit) + data 청크. 형식이 고정이라 wave 모듈 없이 직접 패킹
+_WAV_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
+
+
+def pcm_to_wav(raw_pcm: bytes, sample_rate: int = 16000) -> bytes:
+    """16bit mono PCM 앞에 WAV 헤더를 붙여 반환 (BytesIO·wave.Wave_write 생성 없음)."""
+    n = len(raw_pcm)
+    header = _WAV_HEADER.pack(
+        b"RIFF", 36 + n, b"WAVE",
+        b"fmt ", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16,
+        b"data", n,
+    )
+    return header + raw_pcm
+
 
 # ── STT: Gemini 1.5 Flash ──
 async def speech_to_text_gemini(raw_pcm: bytes, sample_rate: int = 16000) -> str:
-    model = ChatGoogleGenerativeAI(model="gemini-1.5-flash")
-    wav_data = _pcm_to_wav(raw_pcm, sample_rate)
-    audio_b64 = base64.b64encode(wav_data).decode("utf-8")
+    model = get_stt_llm()
+    wav_data = pcm_to_wav(raw_pcm, sample_rate)
+    audio_b64 = base64.b64encode(wav_data).decode("ascii")  # base64는 ASCII: UTF-8 검증 없이 디코드
     
-    response = model.invoke([
+    # ainvoke: 동기 invoke는 이벤트 루프를 막아 다른 WS 연결까지 멈춤
+    response = await model.ainvoke([
         {"text": "Transcribe the following audio exactly into Korean text. Return ONLY the text."},
         {"inline_data": {"mime_type": "audio/wav", "data": audio_b64}}
     ])
     return response.content.strip()
 
 
+def _get_openai_client() -> openai.AsyncOpenAI:
+    """OpenAI TTS 클라이언트 싱글톤 (HTTP/2 커넥션 풀 재사용 — 턴마다 TLS 핸드셰이크 방지). OPENAI_API_KEY 필요."""
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = openai.AsyncOpenAI(
+            http_client=httpx.AsyncClient(
+                http2=True,
+                timeout=httpx.Timeout(30.0, connect=5.0),
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            )
+        )
+    return _openai_client
+
+
+async def close_openai_client() -> None:
+    """앱 종료 시 OpenAI 클라이언트 연결 정리."""
+    global _openai_client
+    if _openai_client is not None:
+        await _openai_client.close()
+        _openai_client = None
+
+
 async def text_to_speech_openai(text: str) -> bytes:
-    client = openai.AsyncOpenAI() # API 키 설정 필요
-    response = await client.audio.speech.create(
-        model="tts-1",
-        voice="alloy", # 원하는 목소리 선택
+    response = await _get_openai_client().audio.speech.create(
+        model=TTS_MODEL,
+        voice=TTS_VOICE, # 원하는 목소리 선택
         input=text,
-        response_format="wav" # 여기서 wav로 지정
+        response_format=TTS_FORMAT # 여기서 wav로 지정
     )
     return response.content
 
-"""
-    # ── TTS: Google Cloud TTS ──
-    async def text_to_speech_google(text: str) -> bytes:
-        client = texttospeech.TextToSpeechClient()
-        synthesis_input = texttospeech.SynthesisInput(text=text)
-        
-        voice = texttospeech.VoiceSelectionParams(
-            language_code="ko-KR", 
-            name="ko-KR-Standard-A", # 테스트용 여성 음성
-            ssml_gender=texttospeech.SsmlVoiceGender.FEMALE
-        )
-        # 프론트 명세에 맞춰 WAV 형식으로 생성
-        audio_config = texttospeech.AudioConfig(audio_encoding=texttospeech.AudioEncoding.LINEAR16)
 
-        response = client.synthesize_speech(
-            input=synthesis_input, voice=voice, audio_config=audio_config
-        )
-        return response.audio_content
-"""
+async def text_to_speech_openai_stream(text: str):
+    """OpenAI TTS 스트리밍: 전체 합성을 기다리지 않고 WAV 바이트 청크를 받는 대로 yield."""
+    async with _get_openai_client().audio.speech.with_streaming_response.create(
+        model=TTS_MODEL,
+        voice=TTS_VOICE,
+        input=text,
+        response_format=TTS_FORMAT,
+    ) as response:
+        async for chunk in response.iter_bytes(TTS_STREAM_CHUNK):
+            yield chunk
+
+
+# ── TTS 캐시 ──
+def _tts_key(text: str) -> str:
+    return "tts:" + content_key(text, TTS_VOICE, TTS_MODEL, TTS_FORMAT)
+
+
+def _get_redis():
+    """REDIS_URL이 있으면 redis.asyncio 클라이언트 싱글톤, 없거나 redis 미설치면 None."""
+    global _redis
+    if _redis is None:
+        url = os.environ.get("REDIS_URL")
+        if not url:
+            _redis = False
+        else:
+            try:
+                import redis.asyncio as redis_asyncio
+                _redis = redis_asyncio.from_url(url)
+            except ImportError:
+                logger.warning("REDIS_URL이 설정됐지만 redis 패키지가 없어 프로세스 내 캐시만 사용합니다.")
+                _redis = False
+    return _redis or None
+
+
+async def _tts_cache_get(key: str) -> bytes | None:
+    audio = _tts_cache.get(key)
+    if audio is not None:
+        return audio
+    r = _get_redis()
+    if r is None:
+        return None
+    try:
+        audio = await r.get(key)
+    except Exception as e:
+        logger.warning("TTS Redis 조회 실패: %s", e)
+        return None
+    if audio:
+        _tts_cache.set(key, audio)
+    return audio or None
+
+
+async def _tts_cache_set(key: str, audio: bytes) -> None:
+    _tts_cache.set(key, audio)
+    r = _get_redis()
+    if r is None:
+        return
+    try:
+        await r.set(key, audio, ex=TTS_CACHE_TTL)
+    except Exception as e:
+        logger.warning("TTS Redis 저장 실패: %s", e)
+
+
+async def text_to_speech_cached(text: str) -> bytes:
+    """text_to_speech_openai + 캐시. 같은 문구는 한 번만 합성."""
+    key = _tts_key(text)
+    audio = await _tts_cache_get(key)
+    if audio is None:
+        audio = await text_to_speech_openai(text)
+        await _tts_cache_set(key, audio)
+    return audio
+
+
+async def text_to_speech_stream_cached(text: str):
+    """
+    text_to_speech_openai_stream + 캐시.
+    캐시 적중 시 전체 WAV를 한 청크로, 미스 시 스트리밍하면서 모아 두었다가 끝나면 저장.
+    """
+    key = _tts_key(text)
+    audio = await _tts_cache_get(key)
+    if audio is not None:
+        yield audio
+        return
+    buf = bytearray()
+    async for chunk in text_to_speech_openai_stream(text):
+        buf.extend(chunk)
+        yield chunk
+    if buf:
+        await _tts_cache_set(key, bytes(buf))
+
+
+async def prewarm_tts_cache(phrases) -> None:
+    """고정 문구들을 미리 합성해 캐시에 적재. 실패하면(키 없음 등) 중단하고 요청 시 합성."""
+    for text in phrases:
+        try:
+            await text_to_speech_cached(text)
+        except Exception as e:
+            logger.warning("TTS 사전 합성 실패 (%s): %s", text, e)
+            return
@@ -1,43 +1,91 @@
-import json
-from urllib import response
-import requests
+import logging
+import httpx
+from pydantic import BaseModel, Field
 from quiz_chain import get_llm
 from app.schemas.user import InterestEnum
 
-def fetch_youtube_subscriptions(access_token: str):
-    """유튜브 API를 통해 유저의 구독 채널 목록을 가져옵니다."""
-    url = "https://www.googleapis.com/youtube/v3/subscriptions"
+logger = logging.getLogger(__name__)
+
+YOUTUBE_SUBSCRIPTIONS_URL = "https://www.googleapis.com/youtube/v3/subscriptions"
+# 관심사 분석에 넣을 채널 수 상한 (입력 토큰 제한)
+MAX_ANALYZED_CHANNELS = 50
+MAX_INTERESTS = 5
+# 프롬프트용 허용 태그 문자열 (호출마다 enum 순회·join 하지 않음)
+_ALLOWED_INTEREST_JOINED = ", ".join(e.value for e in InterestEnum)
+
+
+class InterestResult(BaseModel):
+    """관심사 분석 LLM 구조화 출력 (허용 태그 enum으로 제한)."""
+    interests: list[InterestEnum] = Field(description="사용자의 핵심 관심사 태그 (최대 5개)")
+
+# YouTube API 공유 클라이언트 (HTTP/2 + keep-alive, 호출마다 TLS 연결 생성 방지)
+_yt_client = None
+_interest_llm = None
+
+
+def _get_yt_client() -> httpx.AsyncClient:
+    global _yt_client
+    if _yt_client is None:
+        _yt_client = httpx.AsyncClient(
+            http2=True,
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=20),
+        )
+    return _yt_client
+
+
+async def close_youtube_client() -> None:
+    """앱 종료 시 YouTube API 클라이언트 연결 정리."""
+    global _yt_client
+    if _yt_client is not None:
+        await _yt_client.aclose()
+        _yt_client = None
+
+
+async def fetch_youtube_subscriptions(access_token: str):
+    """유튜브 API를 통해 유저의 구독 채널 목록을 가져옵니다. (관련도순 최대 50개 — 관심사 분석 입력 상한과 동일)"""
     params = {
         "part": "snippet",
-        "mine": True,
+        "mine": "true",
         "maxResults": 50,
         "order": "relevance"
     }
     headers = {"Authorization": f"Bearer {access_token}"}
     
-    response = requests.get(url, params=params, headers=headers)
+    try:
+        response = await _get_yt_client().get(YOUTUBE_SUBSCRIPTIONS_URL, params=params, headers=headers)
+    except httpx.HTTPError as e:
+        logger.warning("YouTube 구독 목록 요청 실패: %s", e)
+        return []
     if response.status_code != 200:
         return []
     
     items = response.json().get("items", [])
     return [item["snippet"]["title"] for item in items]
 
-# services/youtube_service.py 수정 (디버깅용)
+
+def _get_interest_llm():
+    """InterestResult를 바로 반환하는 구조화 출력 모델 싱글톤 (JSON 펜스 파싱 불필요)."""
+    global _interest_llm
+    if _interest_llm is None:
+        _interest_llm = get_llm().with_structured_output(InterestResult)
+    return _interest_llm
+
 
 async def analyze_interests_with_llm(channel_names: list):
-    print(f"🔍 분석 시작 - 가져온 채널 수: {len(channel_names)}") # 디버깅 추가
+    logger.debug("관심사 분석 시작 - 채널 수: %d", len(channel_names))
     if not channel_names:
-        print("❌ 채널 목록이 비어있어 분석을 중단합니다.")
+        logger.info("채널 목록이 비어있어 관심사 분석을 중단합니다.")
         return None
 
+    # 중복 제거(순서 유지) 후 상한까지만 분석
+    channel_names = list(dict.fromkeys(channel_names))[:MAX_ANALYZED_CHANNELS]
+
     try:
-        llm = get_llm()
-        allowed_values = [e.value for e in InterestEnum]
-        
         prompt = f"""
         당신은 유튜브 구독 목록을 분석하는 전문가입니다. 
         목록: {', '.join(channel_names)}
-        허용 태그: {', '.join(allowed_values)}
+        허용 태그: {_ALLOWED_INTEREST_JOINED}
         분석 절차:
         
         1. 각 채널이 어떤 주제인지 추론하세요.
@@ -51,22 +99,13 @@ async def analyze_interests_with_llm(channel_names: list):
         - 채널 이름에서 직접 유추 가능한 태그를 우선
         - 서로 다른 분야를 우선 선택 (다양성)
         - 확신이 높은 태그만 선택
-        
-        형식: {{"interests": ["태그1", "태그2"]}}
         """
         
-        response = await llm.ainvoke(prompt)
-        content = response.content.strip()
-        print(f"🤖 LLM 응답 원본: {content}") # 디버깅 추가
-
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0].strip()
-        
-        data = json.loads(content)
-        valid_interests = [i for i in data.get("interests", []) if i in allowed_values][:5]
+        result = await _get_interest_llm().ainvoke(prompt)
+        valid_interests = list(dict.fromkeys(i.value for i in result.interests))[:MAX_INTERESTS]
         
-        print(f"✅ 최종 추출된 관심사: {valid_interests}")
+        logger.debug("최종 추출된 관심사: %s", valid_interests)
         return {"interests": valid_interests}
     except Exception as e:
-        print(f"🔥 분석 중 에러 발생: {str(e)}") # 에러 내용 출력
+        logger.exception("관심사 분석 중 에러 발생: %s", e)
         return None
\ No newline at end of file
@@ -0,0 +1,51 @@
+"""services.hedge.first_valid: 늦은 시도는 헤지, 유효한 첫 결과 사용, 나머지 취소."""
+
+import asyncio
+
+import pytest
+
+from services.hedge import first_valid
+
+
+def _scripted(*steps):
+    """호출될 때마다 steps의 (지연 초, 결과 또는 예외)를 차례로 수행하는 attempt와 시작·취소 기록."""
+    log = {"started": 0, "cancelled": 0}
+    steps = list(steps)
+
+    async def attempt():
+        delay, outcome = steps[log["started"]]
+        log["started"] += 1
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            log["cancelled"] += 1
+            raise
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    return attempt, log
+
+
+def test_fast_first_attempt_is_not_hedged():
+    attempt, log = _scripted((0.0, "q1"), (0.0, "q2"))
+    assert asyncio.run(first_valid(attempt, delay=0.5)) == "q1"
+    assert log["started"] == 1
+
+
+def test_slow_attempt_is_hedged_and_cancelled():
+    attempt, log = _scripted((1.0, "slow"), (0.0, "fast"))
+    assert asyncio.run(first_valid(attempt, delay=0.05)) == "fast"
+    assert log == {"started": 2, "cancelled": 1}
+
+
+def test_invalid_or_failed_attempt_retries_immediately():
+    attempt, log = _scripted((0.0, ""), (0.0, RuntimeError("boom")), (0.0, "ok"))
+    assert asyncio.run(first_valid(attempt, delay=10)) == "ok"
+    assert log["started"] == 3
+
+
+def test_all_attempts_fail_raises_last_error():
+    attempt, _ = _scripted((0.0, RuntimeError("a")), (0.0, RuntimeError("b")))
+    with pytest.raises(RuntimeError, match="b"):
+        asyncio.run(first_valid(attempt, attempts=2, delay=10))
@@ -0,0 +1,63 @@
+"""퀴즈 그래프: 채점 후 같은 턴에 다음 질문(마지막 문항이면 종료 문구)까지 이어지는지 확인."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("langgraph")
+pytest.importorskip("langchain_core")
+
+from langgraph.checkpoint.memory import MemorySaver  # noqa: E402
+
+import quiz_chain  # noqa: E402
+import services.agent as agent  # noqa: E402
+
+
+@pytest.fixture
+def runnable(monkeypatch):
+    async def always_correct(self):
+        return True
+
+    # LLM·SQLite 없이 그래프만 실행: 채점은 항상 정답, 체크포인터는 메모리
+    monkeypatch.setattr(quiz_chain.QuizGrader, "grade", always_correct)
+    monkeypatch.setattr(agent, "_get_chat_llm", lambda: None)
+    monkeypatch.setattr(agent, "get_checkpointer", MemorySaver)
+    monkeypatch.setattr(agent, "_app_runnable", None)
+    return agent.get_app_runnable()
+
+
+def _say(runnable, text: str) -> dict:
+    config = {"configurable": {"thread_id": "test"}}
+    return asyncio.run(runnable.ainvoke({"messages": [("user", text)]}, config=config))
+
+
+def test_grade_then_next_question_in_one_turn(runnable):
+    quiz_data = quiz_chain.quiz_data
+    first = _say(runnable, "퀴즈 시작")
+    assert first["last_ai"] == agent.ASK_QUESTION_TEMPLATE.format(question=quiz_data[0]["question"])
+
+    result = _say(runnable, quiz_data[0]["answer"])
+    assert result["question_id"] == 1
+    assert result["score"] == 1
+    assert result["last_ai"] == "\n".join(
+        [
+            agent.CORRECT_TEMPLATE.format(score=1),
+            agent.ASK_QUESTION_TEMPLATE.format(question=quiz_data[1]["question"]),
+        ]
+    )
+
+    # 다음 발화는 버려지지 않고 바로 채점됨
+    result = _say(runnable, quiz_data[1]["answer"])
+    assert result["question_id"] == 2
+    assert result["score"] == 2
+
+
+def test_last_answer_finishes_quiz(runnable):
+    quiz_data = quiz_chain.quiz_data
+    _say(runnable, "퀴즈 시작")
+    for item in quiz_data:
+        result = _say(runnable, item["answer"])
+    assert result["question_id"] == len(quiz_data)
+    assert result["last_ai"] == "\n".join(
+        [agent.CORRECT_TEMPLATE.format(score=len(quiz_data)), agent.FINISH_REPLY]
+    )